@@ -0,0 +1,82 @@
+import requests
+import streamlit as st
+from api_cache import get_json
+from thread_pool import script_thread_pool
+from Metrics.tao_price_metrics import fetch_tao_data
+from metagraph import fetch_metagraph
+from subnet_registry import load_subnets
+
+ACCOUNT_PATH = "account/latest/v1"
+
+BALANCE_FIELDS = ["free_balance", "staked_balance", "total_balance", "daily_reward"]
+
+
+# Function to fetch account data for a given address
+def fetch_account_data(address):
+    try:
+        data = get_json(ACCOUNT_PATH, {"address": address})
+        if 'data' in data and len(data['data']) > 0:
+            return data['data'][0]  # Return the first element in the data list
+        else:
+            st.error(f"No data found for address {address}.")
+            return None
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch data for address {address}: {e}")
+        return None
+
+
+# Every distinct wallet address across all subnets, in a stable order
+def all_addresses(subnets=None):
+    subnets = subnets or load_subnets()
+    return list(dict.fromkeys(address for subnet in subnets.values() for address in subnet["wallets"]))
+
+
+# Sum the daily reward of the selected UIDs in a metagraph payload
+def sum_daily_reward(metagraph, uids):
+    uids = set(uids)
+    return sum(float(neuron["daily_reward"]) for neuron in metagraph or [] if neuron["uid"] in uids)
+
+
+# Fetch every account, the price and each metagraph once, in parallel, and
+# compute per-subnet and grand totals from that single snapshot
+def build_portfolio_snapshot(subnets=None):
+    subnets = subnets or load_subnets()
+    addresses = all_addresses(subnets)
+
+    with script_thread_pool(len(addresses) + len(subnets) + 1) as executor:
+        price_future = executor.submit(fetch_tao_data)
+        account_futures = {address: executor.submit(fetch_account_data, address) for address in addresses}
+        metagraph_futures = {netuid: executor.submit(fetch_metagraph, netuid) for netuid in subnets}
+
+        tao_data = price_future.result()
+        accounts = {address: future.result() for address, future in account_futures.items()}
+        metagraphs = {netuid: future.result() for netuid, future in metagraph_futures.items()}
+
+    subnet_metrics = {}
+    for netuid, subnet in subnets.items():
+        metrics = {field: 0 for field in BALANCE_FIELDS}
+        for address in subnet["wallets"]:
+            account_data = accounts.get(address)
+            if account_data:
+                metrics["free_balance"] += int(account_data['balance_free'])
+                metrics["staked_balance"] += int(account_data['balance_staked'])
+                metrics["total_balance"] += int(account_data['balance_total'])
+        metrics["daily_reward"] = sum_daily_reward(metagraphs.get(netuid), subnet["reward_uids"])
+        subnet_metrics[netuid] = metrics
+
+    # A wallet may be listed under several subnets: the balance totals count each
+    # address once, while daily rewards add up per subnet
+    total = {field: 0.0 for field in BALANCE_FIELDS}
+    for address in addresses:
+        account_data = accounts.get(address)
+        if account_data:
+            total["free_balance"] += int(account_data['balance_free'])
+            total["staked_balance"] += int(account_data['balance_staked'])
+            total["total_balance"] += int(account_data['balance_total'])
+    total["daily_reward"] = float(sum(metrics["daily_reward"] for metrics in subnet_metrics.values()))
+
+    return {
+        "price": float(tao_data["price"]) if tao_data else 0.0,
+        "subnets": subnet_metrics,
+        "total": total,
+    }
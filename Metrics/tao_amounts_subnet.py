@@ -0,0 +1,51 @@
+import streamlit as st
+from Metrics.portfolio import build_portfolio_snapshot
+from subnet_registry import get_subnet
+
+
+# Function to display the Account Metrics of one subnet
+
+def display_account_subnet(netuid, snapshot=None):
+    if snapshot is None:
+        snapshot = build_portfolio_snapshot()
+
+    metrics = snapshot["subnets"][netuid]
+    total_free_balance = metrics["free_balance"]
+    total_staked_balance = metrics["staked_balance"]
+    total_total_balance = metrics["total_balance"]
+    total_daily_reward = metrics["daily_reward"]
+    tao_data = {"price": snapshot["price"]}
+
+    # Balances summed over several wallets are labelled as totals
+    prefix = "Total " if len(get_subnet(netuid)["wallets"]) > 1 else ""
+
+    # Display metrics in Streamlit
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            label=f"{prefix}Free Balance",
+            value=f"{total_free_balance / 1000000000:,.3} 𝜏",
+            delta=f"${total_free_balance * float(tao_data['price']) / 1000000000:,.2f}"
+        )
+
+    with col2:
+        st.metric(
+            label=f"{prefix}Staked Balance",
+            value=f"{total_staked_balance / 1000000000:,.3} 𝜏",
+            delta=f"${total_staked_balance * float(tao_data['price']) / 1000000000:,.2f}"
+        )
+
+    with col3:
+        st.metric(
+            label="Total Balance",
+            value=f"{total_total_balance / 1000000000:,.3} 𝜏",
+            delta=f"${total_total_balance * float(tao_data['price']) / 1000000000:,.2f}"
+        )
+
+    with col4:
+        st.metric(
+            label="Total Daily Reward",
+            value=f"{total_daily_reward / 1000000000:,.3} 𝜏",
+            delta=f"${total_daily_reward * float(tao_data['price']) / 1000000000:,.2f}/day"
+        )
@@ -1,30 +1,19 @@
 import streamlit as st
-from Metrics.tao_amounts_sn45 import display_account_sn45
-from Metrics.tao_amounts_sn30 import display_account_sn30
-from Metrics.tao_price_metrics import fetch_tao_data
+from Metrics.portfolio import build_portfolio_snapshot
 
-def fetch_combined_metrics():
-    tao_data = fetch_tao_data()
 
-    # Metrics for SN45
-    sn45_metrics = display_account_sn45(return_data=True)
+def fetch_combined_metrics(snapshot=None):
+    if snapshot is None:
+        snapshot = build_portfolio_snapshot()
 
-    # Metrics for SN30
-    sn30_metrics = display_account_sn30(return_data=True)
-
-    combined_metrics = {
-        "free_balance": float(sn45_metrics["free_balance"]) + float(sn30_metrics["free_balance"]),
-        "staked_balance": float(sn45_metrics["staked_balance"]) + float(sn30_metrics["staked_balance"]),
-        "total_balance": float(sn45_metrics["total_balance"]) + float(sn30_metrics["total_balance"]),
-        "daily_reward": float(sn45_metrics["daily_reward"]) + float(sn30_metrics["daily_reward"]),
-        "price": float(tao_data["price"]),
-    }
+    combined_metrics = dict(snapshot["total"])
+    combined_metrics["price"] = snapshot["price"]
 
     return combined_metrics
 
 # Function to display the combined metrics for SN30 and SN45
-def display_account_total():
-    combined_metrics = fetch_combined_metrics()
+def display_account_total(snapshot=None):
+    combined_metrics = fetch_combined_metrics(snapshot)
 
     col1, col2, col3, col4 = st.columns(4)
 
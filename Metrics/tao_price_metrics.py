@@ -1,17 +1,13 @@
 import requests
 import streamlit as st
+from api_cache import get_json
 
-def fetch_tao_data():
-    api_url = "https://api.taostats.io/api/price/latest/v1?asset=tao"
-    headers = {
-        'Authorization': st.secrets["API_TAO"],
-        'accept': 'application/json'
-    }
+PRICE_PATH = "price/latest/v1"
+PRICE_PARAMS = {"asset": "tao"}
 
+def fetch_tao_data():
     try:
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json(PRICE_PATH, PRICE_PARAMS)
         if 'data' in data and len(data['data']) > 0:
             tao_data = data['data'][0]
             tao_data['price'] = float(tao_data['price'])  # Ensure price is a float
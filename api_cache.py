@@ -0,0 +1,116 @@
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import api_client
+
+# Seconds a response stays fresh, keyed by taostats endpoint
+ENDPOINT_TTLS = {
+    "price/latest": 60,
+    "account/latest": 120,
+    "metagraph/latest": 300,
+}
+DEFAULT_TTL = 60
+
+# Process-wide state, shared by every Streamlit session
+_entries = {}  # key -> (expires_at, value)
+_in_flight = {}  # key -> _PendingCall
+_lock = threading.Lock()
+_totals = {"hit": 0, "miss": 0, "coalesced": 0}
+
+
+class _PendingCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# Pick the TTL for an endpoint path from the endpoint table
+def ttl_for(path):
+    for endpoint, ttl in ENDPOINT_TTLS.items():
+        if endpoint in path:
+            return ttl
+    return DEFAULT_TTL
+
+
+def cache_key(path, params=None):
+    return path, tuple(sorted((params or {}).items()))
+
+
+# Count a cache outcome process-wide and for the current render
+def _record(outcome):
+    _totals[outcome] += 1
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return
+    stats = st.session_state.setdefault("api_cache_stats", {"hit": 0, "miss": 0, "coalesced": 0})
+    stats[outcome] += 1
+
+
+# Reset the per-render counters; call once at the top of each script run
+def reset_render_stats():
+    st.session_state["api_cache_stats"] = {"hit": 0, "miss": 0, "coalesced": 0}
+
+
+def render_stats():
+    return dict(st.session_state.get("api_cache_stats", {"hit": 0, "miss": 0, "coalesced": 0}))
+
+
+def total_stats():
+    with _lock:
+        return dict(_totals)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+# Return the cached value for key, or run loader once for all concurrent callers
+def cached_call(key, ttl, loader):
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] > now:
+            _record("hit")
+            return entry[1]
+        pending = _in_flight.get(key)
+        is_owner = pending is None
+        if is_owner:
+            pending = _PendingCall()
+            _in_flight[key] = pending
+        _record("miss" if is_owner else "coalesced")
+
+    if not is_owner:
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.value
+
+    try:
+        pending.value = loader()
+    except Exception as e:
+        pending.error = e
+        raise
+    else:
+        with _lock:
+            now = time.monotonic()
+            for stale in [k for k, (expires_at, _) in _entries.items() if expires_at <= now]:
+                del _entries[stale]
+            _entries[key] = (now + ttl, pending.value)
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
+        pending.done.set()
+    return pending.value
+
+
+# Cached, coalesced GET of a taostats endpoint path through the shared API client
+def get_json(path, params=None, key="API_TAO", ttl=None):
+    return cached_call(
+        cache_key(path, params),
+        ttl if ttl is not None else ttl_for(path),
+        lambda: api_client.get_json(path, params, key),
+    )
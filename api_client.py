@@ -0,0 +1,158 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import API, measure
+from settings import get_setting
+
+API_BASE_URL = get_setting("TAOSTATS_BASE_URL", "https://api.taostats.io/api").rstrip("/")
+
+# (connect, read) timeouts in seconds
+TIMEOUT = (
+    float(get_setting("TAOSTATS_CONNECT_TIMEOUT", 3.05)),
+    float(get_setting("TAOSTATS_READ_TIMEOUT", 15)),
+)
+
+# Retry policy for throttled or failing responses
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per minute allowed by each API key's quota
+KEY_RATE_LIMITS = {
+    "API_TAO": float(get_setting("API_TAO_RPM", 5)),
+    "API_TAO_30": float(get_setting("API_TAO_30_RPM", 5)),
+    "API_TAO_45": float(get_setting("API_TAO_45_RPM", 5)),
+}
+DEFAULT_RATE_LIMIT = 5.0
+
+# Responses kept for conditional requests (If-None-Match / If-Modified-Since),
+# oldest dropped first
+MAX_CONDITIONAL_ENTRIES = 256
+
+_session = None
+_session_lock = threading.Lock()
+_limiters = {}
+_limiters_lock = threading.Lock()
+_conditional = {}  # (url, params, key) -> (validator headers, parsed body)
+_conditional_lock = threading.Lock()
+
+
+# Token bucket that blocks callers until the key has quota left
+class RateLimiter:
+    def __init__(self, per_minute):
+        self.capacity = max(per_minute, 1.0)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# One pooled keep-alive session for the whole process
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["accept"] = "application/json"
+            _session = session
+        return _session
+
+
+def get_limiter(key):
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(KEY_RATE_LIMITS.get(key, DEFAULT_RATE_LIMIT))
+        return _limiters[key]
+
+
+# Full-jitter exponential backoff, honouring Retry-After when the API sends it
+def _backoff(attempt, response=None):
+    if response is not None and response.headers.get("Retry-After", "").isdigit():
+        return min(float(response.headers["Retry-After"]), BACKOFF_CAP)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+# Validators the API sent with a response, as request headers for revalidating it
+def _validators(response):
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = response.headers["Last-Modified"]
+    return validators
+
+
+def _remember(conditional_key, validators, body):
+    with _conditional_lock:
+        _conditional.pop(conditional_key, None)
+        _conditional[conditional_key] = (validators, body)
+        while len(_conditional) > MAX_CONDITIONAL_ENTRIES:
+            del _conditional[next(iter(_conditional))]
+
+
+# GET a taostats endpoint path (e.g. "price/latest/v1") using the given API key.
+# When an earlier response carried an ETag or Last-Modified it is revalidated,
+# and a 304 returns the earlier parsed body (the same object) without a download.
+def get_json(path, params=None, key="API_TAO"):
+    url = f"{API_BASE_URL}/{path.lstrip('/')}"
+    # Validators and bodies are kept per API key, since each key may see its own data
+    conditional_key = (url, tuple(sorted((params or {}).items())), key)
+    with _conditional_lock:
+        previous = _conditional.get(conditional_key)
+    headers = {"Authorization": get_setting(key, "")}
+    if previous:
+        headers.update(previous[0])
+    session = get_session()
+    limiter = get_limiter(key)
+
+    with measure(API, path) as size:
+        for attempt in range(MAX_RETRIES + 1):
+            limiter.acquire()
+            try:
+                response = session.get(url, headers=headers, params=params, timeout=TIMEOUT)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(_backoff(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                time.sleep(_backoff(attempt, response))
+                continue
+
+            if response.status_code == 304:
+                if previous:
+                    return previous[1]
+                # Nothing stored to reuse: ask again without any conditional headers
+                headers = {"Authorization": headers["Authorization"]}
+                if attempt < MAX_RETRIES:
+                    continue
+                raise requests.exceptions.HTTPError(f"304 Not Modified with no stored response for {url}", response=response)
+
+            response.raise_for_status()
+            size["bytes"] = len(response.content)
+            body = response.json()
+            validators = _validators(response)
+            if validators:
+                _remember(conditional_key, validators, body)
+            return body
@@ -0,0 +1,111 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+import api_client
+from metagraph import metagraph_history_request
+from rank_backend import STORAGE_ERRORS
+from rank_pipeline import compute_rank_records
+from settings import get_setting
+from subnet_registry import get_subnet
+
+DEFAULT_WORKERS = 4
+
+# Chunk size of each range kind: blocks (about an hour at 12s blocks) or seconds
+DEFAULT_STEPS = {"block": 300, "time": 3600}
+
+# History request parameters bounding a chunk, by range kind (both inclusive)
+RANGE_PARAMS = {
+    "block": ("block_start", "block_end"),
+    "time": ("timestamp_start", "timestamp_end"),
+}
+
+DEFAULT_CHECKPOINT_DIR = "backfill"
+
+
+# Start of each chunk of the inclusive range [start, end]
+def chunk_starts(start, end, step):
+    return list(range(start, end + 1, step))
+
+
+def chunk_params(kind, chunk_start, step, end):
+    first, last = RANGE_PARAMS[kind]
+    return {first: chunk_start, last: min(chunk_start + step - 1, end)}
+
+
+# Every metagraph row of one chunk, following the history pages in order
+def fetch_chunk(netuid, range_params):
+    rows, page = [], 1
+    while page:
+        path, params, key = metagraph_history_request(netuid, range_params, page)
+        payload = api_client.get_json(path, params, key)
+        rows += payload.get("data") or []
+        page = (payload.get("pagination") or {}).get("next_page")
+    return rows
+
+
+# Fetch one chunk, rank it like a live snapshot and store it; returns (inserted, skipped)
+def backfill_chunk(backend, netuid, range_params):
+    records = compute_rank_records(fetch_chunk(netuid, range_params), get_subnet(netuid)["uids"])
+    return backend.write_records(netuid, records)
+
+
+# Completed chunks of one backfill run, kept in a JSON file so an interrupted
+# run resumes where it stopped
+class Checkpoint:
+    def __init__(self, path, plan):
+        self.path = path
+        self.plan = plan
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved["plan"] != plan:
+                raise ValueError(f"Checkpoint {path} was written for a different backfill: {saved['plan']}")
+            self.done = set(saved["done"])
+
+    def mark(self, chunk_start):
+        self.done.add(chunk_start)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        partial = f"{self.path}.partial"
+        with open(partial, "w") as f:
+            json.dump({"plan": self.plan, "done": sorted(self.done)}, f)
+        os.replace(partial, self.path)
+
+
+def checkpoint_path(netuid, kind, start, end, step, checkpoint_dir=None):
+    checkpoint_dir = checkpoint_dir or get_setting("BACKFILL_CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR)
+    return os.path.join(checkpoint_dir, f"sn{netuid}_{kind}_{start}_{end}_{step}.json")
+
+
+# Backfill rank records of a subnet over an inclusive block or unix-time range.
+# Chunks are fetched by parallel workers, which share the API key's rate limit;
+# each stored chunk is checkpointed, and failed chunks are retried on the next run.
+# Returns (inserted, skipped, failed chunk starts).
+def backfill(backend, netuid, kind, start, end, step=None, workers=DEFAULT_WORKERS, checkpoint_dir=None):
+    step = step or DEFAULT_STEPS[kind]
+    plan = {"subnet": netuid, "kind": kind, "start": start, "end": end, "step": step}
+    checkpoint = Checkpoint(checkpoint_path(netuid, kind, start, end, step, checkpoint_dir), plan)
+    pending = [chunk for chunk in chunk_starts(start, end, step) if chunk not in checkpoint.done]
+    print(f"SN{netuid}: {len(pending)} of {len(chunk_starts(start, end, step))} {kind} chunks to backfill")
+
+    inserted, skipped, failed = 0, 0, []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(backfill_chunk, backend, netuid, chunk_params(kind, chunk, step, end)): chunk
+            for chunk in pending
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                chunk_inserted, chunk_skipped = future.result()
+            except (requests.exceptions.RequestException, *STORAGE_ERRORS) as e:
+                failed.append(chunk)
+                print(f"SN{netuid} {kind} {chunk}: failed ({e})")
+                continue
+            checkpoint.mark(chunk)
+            inserted, skipped = inserted + chunk_inserted, skipped + chunk_skipped
+            print(f"SN{netuid} {kind} {chunk}: {chunk_inserted} records inserted, {chunk_skipped} already stored")
+    return inserted, skipped, sorted(failed)
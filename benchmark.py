@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit.logger
+
+import rank_backend
+import rank_window
+import snapshot_fingerprint
+import subnet_registry
+import trend_signals
+from fake_taostats import BLOCK_SECONDS, SyntheticChain
+from ingest import POLL_INTERVAL
+from rank_backend import ParquetRankBackend
+from rank_mongo import create_combined_df, generate_chart, prepare_chart_data, process_and_save_data
+
+# Timings of the rank hot paths (ingest, window reads, chart preparation and
+# spec construction) on synthetic metagraphs, stored in a throwaway local Parquet
+# backend. Results are JSON; --baseline compares them with an earlier run.
+
+BENCH_NETUID = 1
+DEFAULT_NEURONS = [256, 1024, 4096]
+DEFAULT_UIDS = [5, 20]
+DEFAULT_HOURS = [6, 24]
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 1.25
+
+# Chart windows read by each case: raw records and the 5m rollup
+WINDOWS = ["6h", "24h"]
+
+
+# Registry holding only the benchmark subnet, tracking the given UIDs
+def _use_registry(directory, uids):
+    path = os.path.join(directory, "subnets.toml")
+    with open(path, "w") as f:
+        f.write(f"[[subnet]]\nnetuid = {BENCH_NETUID}\nuids = {list(uids)}\n")
+    os.environ["SUBNETS_CONFIG"] = path
+    subnet_registry.load_subnets.cache_clear()
+
+
+def _tracked_uids(neurons, count):
+    return list(range(0, neurons, max(neurons // count, 1)))[:count]
+
+
+def _summary(seconds):
+    return {
+        "min": min(seconds),
+        "median": statistics.median(seconds),
+        "mean": statistics.fmean(seconds),
+        "max": max(seconds),
+    }
+
+
+# Peak traced allocation of one call, measured apart from the timed calls
+def _peak_bytes(call):
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# Time repeat calls of call, then measure its peak memory once; setup runs
+# untimed before every call
+def measure(call, repeat, setup=None):
+    seconds = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        result = call()
+        seconds.append(time.perf_counter() - started)
+    if setup:
+        setup()
+    return result, _summary(seconds), _peak_bytes(call)
+
+
+def run_case(neurons, uid_count, hours, repeat):
+    uids = _tracked_uids(neurons, uid_count)
+    case = {"neurons": neurons, "uids": len(uids), "hours": hours}
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        _use_registry(directory, uids)
+        rank_backend.set_backend(ParquetRankBackend(os.path.join(directory, "rank_data")))
+        # Every case ingests into an empty store: drop the previous case's last
+        # snapshot and trend state, which would make its history look stale
+        rank_window.clear()
+        snapshot_fingerprint.clear()
+        trend_signals.clear()
+
+        # Ingest: one snapshot per poll interval over the history, the last one
+        # under tracemalloc
+        chain = SyntheticChain(neurons=neurons)
+        last_block = chain.current_block()
+        step = POLL_INTERVAL // BLOCK_SECONDS
+        blocks = list(range(last_block - int(hours * 3600 // BLOCK_SECONDS), last_block + 1, step))
+        seconds = []
+        for block in blocks[:-1]:
+            data = chain.metagraph(BENCH_NETUID, block)
+            started = time.perf_counter()
+            process_and_save_data(BENCH_NETUID, data)
+            seconds.append(time.perf_counter() - started)
+        data = chain.metagraph(BENCH_NETUID, blocks[-1])
+        peak = _peak_bytes(lambda: process_and_save_data(BENCH_NETUID, data))
+        results.append({"benchmark": "process_and_save_data", "variant": "per snapshot", **case,
+                        "calls": len(seconds), "seconds": _summary(seconds), "peak_bytes": peak})
+
+        for window in WINDOWS:
+            frame, timing, peak = measure(lambda: create_combined_df(BENCH_NETUID, window), repeat, setup=rank_window.clear)
+            results.append({"benchmark": "create_combined_df", "variant": f"{window} cold", **case,
+                            "rows": len(frame), "calls": repeat, "seconds": timing, "peak_bytes": peak})
+            frame, timing, peak = measure(lambda: create_combined_df(BENCH_NETUID, window), repeat)
+            results.append({"benchmark": "create_combined_df", "variant": f"{window} warm", **case,
+                            "rows": len(frame), "calls": repeat, "seconds": timing, "peak_bytes": peak})
+
+            chart_df, timing, peak = measure(lambda: prepare_chart_data(frame), repeat)
+            results.append({"benchmark": "prepare_chart_data", "variant": window, **case,
+                            "rows": len(chart_df), "calls": repeat, "seconds": timing, "peak_bytes": peak})
+
+            spec_bytes, timing, peak = measure(lambda: generate_chart(chart_df, uids), repeat)
+            results.append({"benchmark": "generate_chart", "variant": window, **case, "rows": len(chart_df),
+                            "calls": repeat, "seconds": timing, "peak_bytes": peak, "spec_bytes": spec_bytes})
+    return results
+
+
+def _result_key(result):
+    return result["benchmark"], result["variant"], result["neurons"], result["uids"], result["hours"]
+
+
+# Results whose median time grew beyond tolerance times the baseline median
+def regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    previous = {_result_key(result): result for result in baseline["results"]}
+    slower = []
+    for result in results:
+        before = previous.get(_result_key(result))
+        if before and result["seconds"]["median"] > before["seconds"]["median"] * tolerance:
+            slower.append((result, before))
+    return slower
+
+
+def _environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the rank ingest, read and chart paths")
+    parser.add_argument("--neurons", type=int, nargs="+", default=DEFAULT_NEURONS, help="neurons per snapshot")
+    parser.add_argument("--uids", type=int, nargs="+", default=DEFAULT_UIDS, help="tracked UIDs")
+    parser.add_argument("--hours", type=float, nargs="+", default=DEFAULT_HOURS, help="hours of history ingested")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed calls per read/chart benchmark")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--baseline", help="JSON results of an earlier run; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed median slowdown against the baseline (default 1.25x)")
+    args = parser.parse_args(argv)
+
+    # The rank module runs outside a Streamlit session here
+    streamlit.logger.set_log_level("error")
+
+    results = []
+    for neurons in args.neurons:
+        for uid_count in args.uids:
+            for hours in args.hours:
+                print(f"neurons={neurons} uids={uid_count} hours={hours:g}", file=sys.stderr)
+                for result in run_case(neurons, uid_count, hours, args.repeat):
+                    results.append(result)
+                    print(f"  {result['benchmark']:<24} {result['variant']:<13} "
+                          f"median {result['seconds']['median'] * 1000:9.2f} ms  "
+                          f"peak {result['peak_bytes'] / 2**20:8.2f} MiB", file=sys.stderr)
+
+    output = json.dumps({"environment": _environment(), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for result, before in slower:
+            print(f"REGRESSION {result['benchmark']} {result['variant']} neurons={result['neurons']} "
+                  f"uids={result['uids']} hours={result['hours']:g}: median "
+                  f"{before['seconds']['median'] * 1000:.2f} ms -> {result['seconds']['median'] * 1000:.2f} ms",
+                  file=sys.stderr)
+        if slower:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+import requests
+
+# Local stand-in for the taostats endpoints this dashboard uses. Point the app,
+# ingestion or backfill at it with TAOSTATS_BASE_URL=http://127.0.0.1:<port>/api.
+
+DEFAULT_PORT = 8765
+DEFAULT_NEURONS = 256
+
+# Synthetic chain: block numbers follow the clock from a fixed genesis, and
+# rewards change once per epoch (tempo) like on the real subnets
+GENESIS_BLOCK = 4_000_000
+GENESIS_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+BLOCK_SECONDS = 12
+TEMPO = 360
+
+# Blocks between stored snapshots of the metagraph history, and its page size
+HISTORY_INTERVAL = 25
+HISTORY_PAGE_LIMIT = 50
+
+# Share of neurons that are validators, and the immunity cycle in epochs
+VALIDATOR_SHARE = 0.1
+IMMUNITY_CYCLE = 50
+IMMUNITY_EPOCHS = 2
+
+
+def _iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _unix(moment):
+    return int(moment.timestamp())
+
+
+# Deterministic synthetic chain state: prices, account balances and metagraphs of
+# any size, identical across runs for the same seed
+class SyntheticChain:
+    def __init__(self, neurons=DEFAULT_NEURONS, seed=0, speed=1.0):
+        self.neurons = neurons
+        self.seed = seed
+        self.speed = speed
+        self.started = time.time()
+        self._subnets = {}
+        self._lock = threading.Lock()
+
+    # Simulated now: runs speed times faster than the wall clock since start
+    def now(self):
+        return datetime.fromtimestamp(self.started + (time.time() - self.started) * self.speed, timezone.utc)
+
+    def block_at(self, moment):
+        return GENESIS_BLOCK + int((moment - GENESIS_TIME).total_seconds() // BLOCK_SECONDS)
+
+    def block_time(self, block):
+        return GENESIS_TIME + timedelta(seconds=(block - GENESIS_BLOCK) * BLOCK_SECONDS)
+
+    def current_block(self):
+        return self.block_at(self.now())
+
+    # Per-subnet constants: base reward, validator flags and immunity phase of each uid
+    def _subnet(self, netuid):
+        with self._lock:
+            if netuid not in self._subnets:
+                rng = np.random.default_rng([self.seed, netuid])
+                self._subnets[netuid] = {
+                    "base": rng.lognormal(np.log(2e9), 1.0, self.neurons),
+                    "validator": rng.random(self.neurons) < VALIDATOR_SHARE,
+                    "trust": rng.uniform(0.5, 1.0, self.neurons),
+                    "phase": rng.integers(0, IMMUNITY_CYCLE, self.neurons),
+                }
+            return self._subnets[netuid]
+
+    # Metagraph of a subnet at a block, ordered by reward (emission_desc)
+    def metagraph(self, netuid, block):
+        subnet = self._subnet(netuid)
+        # Epochs run where (block + netuid + 2) is a multiple of (tempo + 1), as on subtensor
+        epoch = (block + netuid + 2) // (TEMPO + 1)
+        factor = np.random.default_rng([self.seed, netuid, epoch]).uniform(0.8, 1.2, self.neurons)
+        immune = (epoch + subnet["phase"]) % IMMUNITY_CYCLE < IMMUNITY_EPOCHS
+        rewards = (subnet["base"] * factor * np.where(immune, 0.1, 1.0)).astype(np.int64)
+        timestamp = _iso(self.block_time(block))
+        return [
+            {
+                "uid": int(uid),
+                "netuid": netuid,
+                "block_number": block,
+                "timestamp": timestamp,
+                "daily_reward": str(rewards[uid]),
+                "is_immunity_period": bool(immune[uid]),
+                "validator_trust": f"{subnet['trust'][uid]:.5f}" if subnet["validator"][uid] else "0",
+            }
+            for uid in np.argsort(-rewards, kind="stable")
+        ]
+
+    # Blocks with a stored history snapshot in [first, last]
+    def history_blocks(self, first, last):
+        start = first + (-first) % HISTORY_INTERVAL
+        return range(start, min(last, self.current_block()) + 1, HISTORY_INTERVAL)
+
+    def price(self):
+        hours = (self.now() - GENESIS_TIME).total_seconds() / 3600
+        price = 400 + 25 * np.sin(hours / 24)
+        return [{
+            "name": "Bittensor",
+            "symbol": "TAO",
+            "price": f"{price:.4f}",
+            "percent_change_24h": f"{np.cos(hours / 24) * 2:.4f}",
+            "circulating_supply": f"{8_000_000 + hours * 300:.0f}",
+            "max_supply": "21000000",
+            "last_updated": _iso(self.now()),
+        }]
+
+    def account(self, address):
+        digest = int(hashlib.sha256(f"{self.seed}:{address}".encode()).hexdigest(), 16)
+        free = digest % 10**11
+        staked = digest // 10**11 % 10**13
+        return [{
+            "address": {"ss58": address},
+            "block_number": self.current_block(),
+            "timestamp": _iso(self.now()),
+            "balance_free": str(free),
+            "balance_staked": str(staked),
+            "balance_total": str(free + staked),
+        }]
+
+
+# Recorded responses, one JSON file per request under a directory
+def _recording_name(path, params):
+    digest = hashlib.sha1(json.dumps(sorted(params.items())).encode()).hexdigest()[:16]
+    return f"{path.strip('/').replace('/', '_')}-{digest}.json"
+
+
+def load_recordings(directory):
+    recordings = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                recording = json.load(f)
+            recordings[_recording_name(recording["path"], recording["params"])] = recording
+    return recordings
+
+
+# Serves the taostats endpoints from the synthetic chain, from recordings
+# (replay), or from a real upstream while saving what it returns (record);
+# adds the configured latency and errors to every request
+class FakeTaostats:
+    def __init__(self, chain=None, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, error_statuses=(500,),
+                 replay_dir=None, record_dir=None, upstream=None, seed=0):
+        self.chain = chain or SyntheticChain(seed=seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.replay = load_recordings(replay_dir) if replay_dir else None
+        self.record_dir = record_dir
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # Latency to add and error status to return (or None) for the next request
+    def _faults(self):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self._random.gauss(self.latency_ms, self.jitter_ms)) / 1000 if self.latency_ms else 0.0
+            status = self._random.choice(self.error_statuses) if self._random.random() < self.error_rate else None
+        return delay, status
+
+    # (status, payload) of a request; path is relative to /api
+    def respond(self, path, params, headers=None):
+        delay, status = self._faults()
+        time.sleep(delay)
+        if status is not None:
+            return status, {"error": f"injected {status}"}
+        if self.replay is not None:
+            recording = self.replay.get(_recording_name(path, params))
+            if recording is None:
+                return 404, {"error": f"no recording for {path} {params}"}
+            return recording["status"], recording["body"]
+        if self.upstream:
+            return self._record(path, params, headers or {})
+        return self._synthetic(path, params)
+
+    def _record(self, path, params, headers):
+        response = requests.get(
+            f"{self.upstream}/{path}", params=params, timeout=30,
+            headers={"Authorization": headers.get("Authorization", ""), "accept": "application/json"},
+        )
+        body = response.json()
+        os.makedirs(self.record_dir, exist_ok=True)
+        with open(os.path.join(self.record_dir, _recording_name(path, params)), "w") as f:
+            json.dump({"path": path, "params": params, "status": response.status_code, "body": body}, f)
+        return response.status_code, body
+
+    def _synthetic(self, path, params):
+        chain = self.chain
+        if path == "price/latest/v1":
+            return 200, {"data": chain.price()}
+        if path == "account/latest/v1":
+            return 200, {"data": chain.account(params.get("address", ""))}
+        if path == "metagraph/latest/v1":
+            return 200, {"data": chain.metagraph(int(params["netuid"]), chain.current_block())}
+        if path == "metagraph/history/v1":
+            return 200, self._history(params)
+        return 404, {"error": f"unknown endpoint {path}"}
+
+    # One page of metagraph history over a block or unix-time range
+    def _history(self, params):
+        chain = self.chain
+        if "timestamp_start" in params:
+            first = chain.block_at(datetime.fromtimestamp(int(params["timestamp_start"]), timezone.utc))
+            last = chain.block_at(datetime.fromtimestamp(int(params.get("timestamp_end", _unix(chain.now()))), timezone.utc))
+        else:
+            first = int(params.get("block_start", GENESIS_BLOCK))
+            last = int(params.get("block_end", chain.current_block()))
+        blocks = chain.history_blocks(first, last)
+        limit = int(params.get("limit", HISTORY_PAGE_LIMIT))
+        page = int(params.get("page", 1))
+        total = len(blocks) * chain.neurons
+        pages = max(1, -(-total // limit))
+
+        rows, offset = [], (page - 1) * limit
+        for index in range(offset // chain.neurons, len(blocks)):
+            if len(rows) >= limit:
+                break
+            snapshot = chain.metagraph(int(params["netuid"]), blocks[index])
+            start = offset - index * chain.neurons if not rows else 0
+            rows += snapshot[max(start, 0):][:limit - len(rows)]
+        return {
+            "pagination": {
+                "current_page": page,
+                "per_page": limit,
+                "total_items": total,
+                "total_pages": pages,
+                "next_page": page + 1 if page < pages else None,
+                "prev_page": page - 1 if page > 1 else None,
+            },
+            "data": rows,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path.removeprefix("/api").strip("/")
+        status, payload = self.server.app.respond(path, dict(parse_qsl(url.query)), dict(self.headers))
+        body = json.dumps(payload).encode()
+        # Successful responses carry an ETag and are revalidated like conditional GETs
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"' if status == 200 else None
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Serve app on a background thread; returns the server (base URL in server.base_url)
+def start_server(app, host="127.0.0.1", port=0):
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.app = app
+    server.base_url = f"http://{host}:{server.server_port}/api"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local taostats stand-in for offline and load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--neurons", type=int, default=DEFAULT_NEURONS, help="neurons per synthetic metagraph")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--speed", type=float, default=1.0, help="how much faster than real time blocks advance")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean added latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="standard deviation of the added latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument("--error-status", type=int, action="append", help="error status to inject (repeatable; default 500)")
+    sources = parser.add_mutually_exclusive_group()
+    sources.add_argument("--replay", metavar="DIR", help="serve responses recorded in DIR")
+    sources.add_argument("--record", metavar="DIR", help="proxy to --upstream and save its responses to DIR")
+    parser.add_argument("--upstream", default="https://api.taostats.io/api", help="API proxied while recording")
+    args = parser.parse_args(argv)
+
+    app = FakeTaostats(
+        chain=SyntheticChain(neurons=args.neurons, seed=args.seed, speed=args.speed),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_statuses=args.error_status or [500],
+        replay_dir=args.replay,
+        record_dir=args.record,
+        upstream=args.upstream if args.record else None,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), _Handler)
+    server.app = app
+    print(f"Serving taostats stand-in at http://{args.host}:{server.server_port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import fcntl
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import requests
+from pymongo.errors import DuplicateKeyError
+
+from instrumentation import export_metrics
+from poll_schedule import SubnetSchedule, near_deregistration
+from rank_backend import STORAGE_ERRORS, MongoRankBackend
+from rank_mongo import ingest_subnet
+from rank_retention import apply_retention
+from rank_store import RANK_DB_NAME
+from snapshot_fingerprint import UNCHANGED, last_snapshot
+from subnet_registry import get_subnet, load_subnets
+
+# Seconds between polls of a subnet whose epoch timing is not known yet
+POLL_INTERVAL = 1080
+
+LOCK_COLLECTION = "locks"
+LOCK_NAME = "rank_ingest"
+
+
+# Lease lock in MongoDB so only one ingestion process polls at a time, across hosts
+class IngestLock:
+    def __init__(self, client, ttl, name=LOCK_NAME):
+        self.collection = client[RANK_DB_NAME][LOCK_COLLECTION]
+        self.ttl = timedelta(seconds=ttl)
+        self.name = name
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    # Take or extend the lease; False while another live process holds it
+    def acquire(self):
+        now = datetime.now(timezone.utc)
+        try:
+            self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"expires_at": {"$lt": now}}, {"owner": self.owner}]},
+                {"$set": {"owner": self.owner, "expires_at": now + self.ttl}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def release(self):
+        self.collection.delete_one({"_id": self.name, "owner": self.owner})
+
+
+# The same lock for deployments without MongoDB: an exclusive flock on a file
+# next to the Parquet data, shared by processes on one host. Taking it is atomic,
+# and the kernel drops it when the holding process exits, so it needs no expiry.
+class FileIngestLock:
+    def __init__(self, path):
+        self.path = path
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._file = None
+
+    # Take the lock, or keep it if already held; False while another process holds it
+    def acquire(self):
+        if self._file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        # The holder's name, for whoever looks at the file
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(self.owner + "\n")
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    # The file stays in place: removing it would let a new process lock a fresh
+    # file while another still waits on the old one
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+def ingest_lock(backend, ttl):
+    if isinstance(backend, MongoRankBackend):
+        return IngestLock(backend.client, ttl)
+    return FileIngestLock(os.path.join(backend.root, f"{LOCK_NAME}.lock"))
+
+
+# Poll one subnet and report what was stored; returns the ingest result, or the
+# request or storage error that stopped it
+def poll_subnet(subnet):
+    try:
+        result = ingest_subnet(subnet)
+    except requests.exceptions.RequestException as e:
+        print(f"SN{subnet}: metagraph request failed: {e}")
+        return e
+    except STORAGE_ERRORS as e:
+        print(f"SN{subnet}: storing rank records failed: {e}")
+        return e
+    if result is None:
+        print(f"SN{subnet}: no metagraph data")
+    elif result == UNCHANGED:
+        print(f"SN{subnet}: snapshot unchanged since block {last_snapshot(subnet)[0]}")
+    else:
+        inserted, skipped = result
+        print(f"SN{subnet}: {inserted} records inserted, {skipped} already stored")
+    return result
+
+
+# Poll each subnet once and report what was stored
+def ingest_once(subnets):
+    for subnet in subnets:
+        poll_subnet(subnet)
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    if response is not None and response.headers.get("Retry-After", "").isdigit():
+        return float(response.headers["Retry-After"])
+    return None
+
+
+# Poll a subnet whose turn has come and plan its next poll
+def poll_scheduled(subnet, schedule):
+    result = poll_subnet(subnet)
+    now = time.time()
+    if isinstance(result, Exception):
+        next_poll = schedule.failed(now, _retry_after(result))
+    else:
+        changed = result is not None and result != UNCHANGED
+        next_poll = schedule.polled(now, last_snapshot(subnet), changed, urgent=near_deregistration(subnet))
+    print(f"SN{subnet}: next poll in {next_poll - now:.0f}s")
+
+
+# Poll every subnet on its own schedule into the rank backend while holding the
+# ingestion lock: shortly after each epoch boundary, sooner while a tracked UID
+# is close to deregistration, and backing off while the API fails
+def run(backend, subnets=None, interval=POLL_INTERVAL, once=False):
+    subnets = subnets or list(load_subnets())
+
+    ttl = interval * 2 + 60
+    lock = ingest_lock(backend, ttl=ttl)
+    if not lock.acquire():
+        print("Another ingestion process holds the lock; exiting.")
+        return False
+
+    try:
+        if isinstance(backend, MongoRankBackend):
+            apply_retention(backend.client)
+        if once:
+            ingest_once(subnets)
+            export_metrics()
+            return True
+
+        now = time.time()
+        schedules = {subnet: SubnetSchedule(subnet, get_subnet(subnet)["tempo"], interval, now) for subnet in subnets}
+        renewed = now
+        while True:
+            due = [subnet for subnet, schedule in schedules.items() if schedule.next_poll <= time.time()]
+            for subnet in due:
+                poll_scheduled(subnet, schedules[subnet])
+            if due:
+                export_metrics()
+
+            # Sleep until the next poll, waking in time to renew the lease
+            wake = min(min(schedule.next_poll for schedule in schedules.values()), renewed + ttl / 3)
+            time.sleep(max(0.0, wake - time.time()))
+            if time.time() >= renewed + ttl / 3:
+                if not lock.acquire():
+                    print("Ingestion lock was lost; exiting.")
+                    return False
+                renewed = time.time()
+    finally:
+        lock.release()
@@ -0,0 +1,208 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from settings import get_setting
+
+# Kinds of instrumented operations
+API = "api"
+MONGO = "mongo"
+STORAGE = "storage"
+SECTION = "section"
+CHART = "chart"
+
+# Latency histogram buckets in seconds, for the Prometheus export
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = "tbd_ebm"
+
+# Process-wide totals, shared by every Streamlit session and thread
+_totals = {}  # (kind, name) -> totals dict
+_lock = threading.Lock()
+_exporter = None
+
+logger = logging.getLogger(__name__)
+
+
+def _new_totals():
+    return {"count": 0, "errors": 0, "seconds": 0.0, "bytes": 0, "documents": 0, "buckets": [0] * len(BUCKETS)}
+
+
+# Count one operation process-wide and for the current rerun
+def record(kind, name, seconds, bytes=0, documents=0, error=False):
+    key = (kind, name)
+    with _lock:
+        totals = _totals.setdefault(key, _new_totals())
+        totals["count"] += 1
+        totals["errors"] += bool(error)
+        totals["seconds"] += seconds
+        totals["bytes"] += bytes or 0
+        totals["documents"] += documents or 0
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                totals["buckets"][index] += 1
+
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return
+        run = st.session_state.setdefault("instrumentation", {})
+        stats = run.setdefault(key, {"count": 0, "errors": 0, "seconds": 0.0, "bytes": 0, "documents": 0})
+        stats["count"] += 1
+        stats["errors"] += bool(error)
+        stats["seconds"] += seconds
+        stats["bytes"] += bytes or 0
+        stats["documents"] += documents or 0
+
+
+# Time the body as one operation; the body may set size["bytes"] or size["documents"]
+@contextmanager
+def measure(kind, name):
+    size = {"bytes": 0, "documents": 0}
+    started = time.perf_counter()
+    error = False
+    try:
+        yield size
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record(kind, name, time.perf_counter() - started, size["bytes"], size["documents"], error)
+
+
+# Start a fresh per-rerun record; call once at the top of each script run
+def reset_render_stats():
+    st.session_state["instrumentation"] = {}
+
+
+def render_stats():
+    with _lock:
+        return {key: dict(stats) for key, stats in st.session_state.get("instrumentation", {}).items()}
+
+
+def total_stats():
+    with _lock:
+        return {key: dict(totals, buckets=list(totals["buckets"])) for key, totals in _totals.items()}
+
+
+def debug_enabled():
+    value = st.query_params.get("debug") or get_setting("DEBUG_SIDEBAR", "")
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+# Sidebar table of this rerun's operations, slowest first, with the taostats
+# cache counts when given
+def render_debug_sidebar(cache_stats=None):
+    rows = [
+        {
+            "kind": kind,
+            "name": name,
+            "count": stats["count"],
+            "errors": stats["errors"],
+            "total ms": round(stats["seconds"] * 1000, 1),
+            "KiB": round(stats["bytes"] / 1024, 1),
+            "docs": stats["documents"],
+        }
+        for (kind, name), stats in render_stats().items()
+    ]
+    rows.sort(key=lambda row: row["total ms"], reverse=True)
+    with st.sidebar:
+        st.subheader("Debug")
+        st.caption(f"{sum(row['count'] for row in rows)} operations this rerun")
+        if cache_stats:
+            st.caption("taostats cache: " + ", ".join(f"{outcome} {count}" for outcome, count in cache_stats.items()))
+        st.dataframe(rows, hide_index=True)
+
+
+def _labels(kind, name, **extra):
+    escaped = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    labels = f'kind="{kind}",name="{escaped}"'
+    for label, value in extra.items():
+        labels += f',{label}="{value}"'
+    return labels
+
+
+# Process-wide totals in the Prometheus text exposition format
+def prometheus_text():
+    totals = total_stats()
+    lines = []
+
+    def family(metric, kind, help_text):
+        lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {kind}")
+
+    family("operations_total", "counter", "Instrumented operations by kind and name.")
+    for (kind, name), stats in sorted(totals.items()):
+        lines.append(f"{METRIC_PREFIX}_operations_total{{{_labels(kind, name)}}} {stats['count']}")
+    family("errors_total", "counter", "Instrumented operations that raised.")
+    for (kind, name), stats in sorted(totals.items()):
+        lines.append(f"{METRIC_PREFIX}_errors_total{{{_labels(kind, name)}}} {stats['errors']}")
+    family("payload_bytes_total", "counter", "Bytes received or produced by instrumented operations.")
+    for (kind, name), stats in sorted(totals.items()):
+        lines.append(f"{METRIC_PREFIX}_payload_bytes_total{{{_labels(kind, name)}}} {stats['bytes']}")
+    family("documents_total", "counter", "Documents or rows returned or written by instrumented operations.")
+    for (kind, name), stats in sorted(totals.items()):
+        lines.append(f"{METRIC_PREFIX}_documents_total{{{_labels(kind, name)}}} {stats['documents']}")
+    family("duration_seconds", "histogram", "Latency of instrumented operations.")
+    for (kind, name), stats in sorted(totals.items()):
+        for bound, count in zip(BUCKETS, stats["buckets"]):
+            lines.append(f"{METRIC_PREFIX}_duration_seconds_bucket{{{_labels(kind, name, le=bound)}}} {count}")
+        lines.append(f"{METRIC_PREFIX}_duration_seconds_bucket{{{_labels(kind, name, le='+Inf')}}} {stats['count']}")
+        lines.append(f"{METRIC_PREFIX}_duration_seconds_sum{{{_labels(kind, name)}}} {stats['seconds']:.6f}")
+        lines.append(f"{METRIC_PREFIX}_duration_seconds_count{{{_labels(kind, name)}}} {stats['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_file(path):
+    partial = f"{path}.partial"
+    with open(partial, "w") as f:
+        f.write(prometheus_text())
+    os.replace(partial, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Serve /metrics on a local port from a background thread, once per process;
+# if the port is taken (e.g. by another app process) the endpoint is skipped
+def start_metrics_server(port, host="127.0.0.1"):
+    global _exporter
+    with _lock:
+        if _exporter is None:
+            try:
+                _exporter = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                logger.warning("metrics endpoint not started on port %d: %s", port, e)
+                _exporter = False
+                return None
+            _exporter.daemon_threads = True
+            threading.Thread(target=_exporter.serve_forever, daemon=True).start()
+        return _exporter or None
+
+
+# Export the totals as configured: METRICS_PORT serves /metrics locally and
+# METRICS_FILE is rewritten (e.g. for node_exporter's textfile collector)
+def export_metrics():
+    port = get_setting("METRICS_PORT")
+    if port:
+        start_metrics_server(int(port))
+    path = get_setting("METRICS_FILE")
+    if path:
+        write_prometheus_file(path)
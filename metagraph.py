@@ -0,0 +1,40 @@
+import requests
+import streamlit as st
+import api_client
+from api_cache import get_json
+from subnet_registry import get_subnet
+
+# API Configuration
+API_PATH = 'metagraph/latest/v1'
+HISTORY_API_PATH = 'metagraph/history/v1'
+HISTORY_PAGE_LIMIT = 200
+
+
+# Metagraph request of a subnet, as (path, params, key)
+def metagraph_request(netuid):
+    return API_PATH, {'netuid': netuid, 'order': 'emission_desc'}, get_subnet(netuid)["api_key"]
+
+
+# Metagraph history request of a subnet for one page of a block or time range
+# (range_params holds block_start/block_end or timestamp_start/timestamp_end)
+def metagraph_history_request(netuid, range_params, page=1):
+    params = {'netuid': netuid, **range_params, 'order': 'block_number_asc', 'page': page, 'limit': HISTORY_PAGE_LIMIT}
+    return HISTORY_API_PATH, params, get_subnet(netuid)["api_key"]
+
+
+# Metagraph rows of a subnet; request errors propagate. fresh skips the shared
+# response cache, for the ingestion process, which revalidates with the API instead
+def load_metagraph(netuid, fresh=False):
+    path, params, key = metagraph_request(netuid)
+    if fresh:
+        return api_client.get_json(path, params, key=key)["data"]
+    return get_json(path, params, key=key)["data"]
+
+
+# Fetch API data
+def fetch_metagraph(netuid):
+    try:
+        return load_metagraph(netuid)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch data: {e}")
+        return None
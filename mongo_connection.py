@@ -0,0 +1,68 @@
+import threading
+
+import pymongo
+from pymongo import monitoring
+from pymongo.errors import ConfigurationError
+
+from instrumentation import MONGO, record
+from settings import get_setting
+
+# Pool and timeout settings, overridable through the environment or st.secrets
+MONGO_MAX_POOL_SIZE = int(get_setting("MONGO_MAX_POOL_SIZE", 20))
+MONGO_MIN_POOL_SIZE = int(get_setting("MONGO_MIN_POOL_SIZE", 0))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(get_setting("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+MONGO_CONNECT_TIMEOUT_MS = int(get_setting("MONGO_CONNECT_TIMEOUT_MS", 5000))
+MONGO_SOCKET_TIMEOUT_MS = int(get_setting("MONGO_SOCKET_TIMEOUT_MS", 20000))
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# Records every command the client runs (count, latency, documents returned or
+# written) under "<command> <collection>"
+class CommandInstrumentation(monitoring.CommandListener):
+    def __init__(self):
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        name = f"{event.command_name} {collection}" if isinstance(collection, str) else event.command_name
+        with self._lock:
+            self._names[event.request_id] = name
+
+    def _finish(self, event, error, documents=0):
+        with self._lock:
+            name = self._names.pop(event.request_id, event.command_name)
+        record(MONGO, name, event.duration_micros / 1e6, documents=documents, error=error)
+
+    def succeeded(self, event):
+        reply = event.reply or {}
+        cursor = reply.get("cursor") or {}
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        self._finish(event, False, len(batch) if batch is not None else reply.get("n", 0))
+
+    def failed(self, event):
+        self._finish(event, True)
+
+
+# The process-wide MongoClient, created on first use and shared by every module,
+# Streamlit session and CLI command
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            uri = get_setting("DB_URI")
+            if not uri:
+                raise ConfigurationError("DB_URI is not configured")
+            _client = pymongo.MongoClient(
+                uri,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                appname="tbd-ebm",
+                event_listeners=[CommandInstrumentation()],
+            )
+        return _client
@@ -0,0 +1,116 @@
+import random
+from datetime import datetime, timezone
+
+from settings import get_setting
+from trend_signals import latest
+
+BLOCK_SECONDS = 12
+
+# Seconds after an expected epoch boundary before polling, so taostats has
+# indexed the new metagraph
+EPOCH_SETTLE_SECONDS = float(get_setting("POLL_EPOCH_SETTLE_SECONDS", 90))
+
+# Random delay added to every poll so subnets don't fire together
+JITTER_SECONDS = float(get_setting("POLL_JITTER_SECONDS", 30))
+
+# First retry when a poll after the boundary still returns the old snapshot;
+# doubles while it stays unchanged
+CATCH_UP_SECONDS = 60.0
+
+# Backoff after a failed poll (API error, 429 or storage error), doubling per failure
+ERROR_BACKOFF_SECONDS = 60.0
+ERROR_BACKOFF_CAP = 1800.0
+
+# Faster cadence while a tracked UID is close to deregistration: fewer than
+# POLL_URGENT_HOURS to the threshold at its current slope, or at most
+# POLL_URGENT_RISK non-immune neurons earning less
+FAST_INTERVAL = float(get_setting("POLL_FAST_INTERVAL", 300))
+URGENT_HOURS = float(get_setting("POLL_URGENT_HOURS", 6))
+URGENT_RISK = int(get_setting("POLL_URGENT_RISK", 2))
+
+
+# Blocks from block to the subnet's next epoch, as subtensor's
+# blocks_until_next_epoch; the epoch runs at the block where it reaches 0
+def blocks_until_epoch(netuid, tempo, block):
+    remaining = tempo - (block + netuid + 1) % (tempo + 1)
+    return remaining or tempo + 1
+
+
+# Unix seconds of a taostats timestamp, or None
+def _unix(timestamp):
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).astimezone(timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+# True when a tracked UID of the subnet is close to deregistration, from the
+# trend signals of its latest record
+def near_deregistration(subnet):
+    for record in latest(subnet).values():
+        reward = record.get("DAILY_REWARD")
+        if record.get("IS_IMMUNE") or not reward or reward != reward:
+            continue
+        hours = record.get("HOURS_TO_DEREGISTER_threshold")
+        if hours is not None and hours == hours and hours <= URGENT_HOURS:
+            return True
+        if record.get("COUNT_NON_IMMUNE_daily_reward_less_UID", URGENT_RISK + 1) <= URGENT_RISK:
+            return True
+    return False
+
+
+# When to poll one subnet next. Polls land shortly after each epoch boundary,
+# found from the last snapshot's block; until a block is known the subnet is
+# polled every fallback_interval seconds.
+class SubnetSchedule:
+    def __init__(self, netuid, tempo, fallback_interval, now, rng=None):
+        self.netuid = netuid
+        self.tempo = tempo
+        self.fallback_interval = fallback_interval
+        self.rng = rng or random.Random()
+        self.failures = 0
+        self.stale = 0
+        self.epoch_due = None
+        # Stagger the first polls of all subnets
+        self.next_poll = now + self._jitter()
+
+    def _jitter(self):
+        return self.rng.uniform(0, JITTER_SECONDS)
+
+    # Expected time of the first poll after the epoch following block, seen at
+    # observed_at; block_time is the block's chain time when known
+    def _epoch_due(self, block, block_time, observed_at):
+        lag = max(0.0, observed_at - block_time) if block_time is not None else 0.0
+        return observed_at - lag + blocks_until_epoch(self.netuid, self.tempo, block) * BLOCK_SECONDS + EPOCH_SETTLE_SECONDS
+
+    # Schedule after a successful poll. snapshot is the (block_number, timestamp)
+    # last processed, changed whether this poll brought a new one
+    def polled(self, now, snapshot, changed, urgent=False):
+        self.failures = 0
+        if snapshot is None:
+            delay = self.fallback_interval
+        else:
+            if changed or self.epoch_due is None:
+                self.epoch_due = self._epoch_due(snapshot[0], _unix(snapshot[1]), now)
+            if self.epoch_due > now:
+                delay = self.epoch_due - now
+                self.stale = 0
+            else:
+                # The boundary has passed but taostats still serves the old epoch
+                delay = min(CATCH_UP_SECONDS * 2 ** self.stale, (self.tempo + 1) * BLOCK_SECONDS)
+                self.stale += 1
+        if urgent:
+            delay = min(delay, FAST_INTERVAL)
+        self.next_poll = now + delay + self._jitter()
+        return self.next_poll
+
+    # Schedule after a failed poll, honouring the API's Retry-After when given
+    def failed(self, now, retry_after=None):
+        self.failures += 1
+        delay = min(ERROR_BACKOFF_CAP, ERROR_BACKOFF_SECONDS * 2 ** (self.failures - 1))
+        if retry_after:
+            delay = max(delay, retry_after)
+        self.next_poll = now + delay + self._jitter()
+        return self.next_poll
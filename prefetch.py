@@ -0,0 +1,49 @@
+from concurrent.futures import wait
+
+import api_cache
+from metagraph import metagraph_request
+from Metrics import portfolio, tao_price_metrics
+from subnet_registry import load_subnets
+from thread_pool import script_thread_pool
+
+# Upper bound on how long the page waits for the prefetch stage, in seconds
+PREFETCH_TIMEOUT = 30
+
+
+# Every taostats request a page render needs, as (path, params, key)
+def page_requests():
+    requests_to_fetch = [
+        (tao_price_metrics.PRICE_PATH, tao_price_metrics.PRICE_PARAMS, "API_TAO"),
+    ]
+    for netuid in load_subnets():
+        requests_to_fetch.append(metagraph_request(netuid))
+    for address in portfolio.all_addresses():
+        requests_to_fetch.append((portfolio.ACCOUNT_PATH, {"address": address}, "API_TAO"))
+    return requests_to_fetch
+
+
+def _fetch_quietly(path, params, key):
+    try:
+        api_cache.get_json(path, params, key=key)
+    except Exception:
+        # The section that needs this response retries and reports the error
+        pass
+
+
+# Start every request concurrently without waiting; sections that need a response
+# before it lands join the in-flight request instead of issuing their own
+def start_prefetch():
+    requests_to_fetch = page_requests()
+    executor = script_thread_pool(len(requests_to_fetch))
+    futures = [executor.submit(_fetch_quietly, *request) for request in requests_to_fetch]
+    executor.shutdown(wait=False)
+    return futures
+
+
+def wait_for_prefetch(futures, timeout=PREFETCH_TIMEOUT):
+    wait(futures, timeout=timeout)
+
+
+# Warm the API cache with every request concurrently so sections render from hits
+def prefetch_page_data():
+    wait_for_prefetch(start_prefetch())
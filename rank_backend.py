@@ -0,0 +1,274 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pymongo.errors import PyMongoError
+
+from mongo_connection import get_client
+from rank_retention import archive_path, first_complete_day, write_partition
+from rank_rollups import ROLLUP_FIELDS, ROLLUPS, get_rollup_collection, rebuild_rollups, update_rollups
+from rank_store import (
+    FRAME_STAT_COLUMNS,
+    FRAME_UID_COLUMNS,
+    RANK_COLLECTION,
+    TIME_FIELD,
+    get_rank_collection,
+    rank_frame_columns,
+    read_latest_records,
+    read_rank_frame,
+    save_rank_records,
+)
+from settings import get_setting
+
+DEFAULT_BACKEND = "mongo"
+DEFAULT_DATA_DIR = "rank_data"
+
+# Errors a backend raises when its storage is unreachable or unreadable
+STORAGE_ERRORS = (PyMongoError, OSError, pa.ArrowException)
+
+# Identity of a raw record: the same UID, block and timestamp is stored once
+RECORD_KEY = ["UID", "MAX_block_number", TIME_FIELD]
+
+# pandas floor frequency of each rollup granularity
+_ROLLUP_FREQ = {"minute": "min", "hour": "h", "day": "D"}
+
+
+# Storage of rank records: writes raw records, reads wide rank frames of raw
+# records or of a rollup granularity
+class RankBackend(ABC):
+    name = None
+
+    # Store the records not already stored and refresh the rollups they fall
+    # into; returns (inserted, skipped)
+    @abstractmethod
+    def write_records(self, subnet, records):
+        ...
+
+    # Wide rank frame of raw records over [since, until)
+    @abstractmethod
+    def read_records(self, subnet, uids, since, until=None):
+        ...
+
+    # Wide rank frame of one rollup granularity over [since, until)
+    @abstractmethod
+    def read_rollups(self, granularity, subnet, uids, since, until=None):
+        ...
+
+    # Latest raw record of each UID at or after since, as {uid: record}
+    @abstractmethod
+    def read_latest(self, subnet, uids, since):
+        ...
+
+    # Recompute all rollups of a subnet from the raw records
+    @abstractmethod
+    def rebuild_rollups(self, subnet):
+        ...
+
+
+class MongoRankBackend(RankBackend):
+    name = "mongo"
+
+    def __init__(self, client):
+        self.client = client
+
+    def write_records(self, subnet, records):
+        inserted, skipped = save_rank_records(get_rank_collection(self.client), subnet, records)
+        if inserted:
+            times = [record[TIME_FIELD] for record in records]
+            update_rollups(self.client, subnet, min(times), max(times))
+        return inserted, skipped
+
+    def read_records(self, subnet, uids, since, until=None):
+        return read_rank_frame(get_rank_collection(self.client), subnet, uids, since, until)
+
+    def read_rollups(self, granularity, subnet, uids, since, until=None):
+        return read_rank_frame(get_rollup_collection(self.client, granularity), subnet, uids, since, until)
+
+    def read_latest(self, subnet, uids, since):
+        return read_latest_records(get_rank_collection(self.client), subnet, uids, since)
+
+    # Days that may have partly expired keep the rollups computed when they were complete
+    def rebuild_rollups(self, subnet):
+        rebuild_rollups(self.client, subnet, first_complete_day())
+
+
+# Naive UTC datetimes at millisecond precision, as MongoDB stores them
+def _naive_utc_ms(values):
+    return pd.to_datetime(values, utc=True).dt.tz_localize(None).astype("datetime64[ms]")
+
+
+def _naive_utc(moment):
+    moment = pd.Timestamp(moment)
+    if moment.tzinfo is not None:
+        moment = moment.tz_convert("UTC").tz_localize(None)
+    return moment
+
+
+def _day(moment):
+    return moment.floor("D").to_pydatetime()
+
+
+# Wide rank frame from long records (one row per UID and timestamp): the
+# subnet-wide stats plus reward, rank and risk columns for each UID
+def wide_rank_frame(records, uids):
+    records = records[records["UID"].isin(list(uids))]
+    if records.empty:
+        return pd.DataFrame()
+    records = records.sort_values(TIME_FIELD, kind="stable").drop_duplicates(["UID", TIME_FIELD], keep="last")
+
+    stats = records.groupby(TIME_FIELD)[list(FRAME_STAT_COLUMNS)].first().rename(columns=FRAME_STAT_COLUMNS)
+    per_uid = records.set_index([TIME_FIELD, "UID"])[list(FRAME_UID_COLUMNS)].unstack("UID")
+    per_uid.columns = [f"{FRAME_UID_COLUMNS[field]}{uid}" for field, uid in per_uid.columns]
+
+    frame = stats.join(per_uid).reset_index()
+    return frame[[column for column in rank_frame_columns(uids) if column in frame.columns]]
+
+
+# Rollup rows of one granularity from a day of raw records: last, min and max of
+# each field per UID and bucket, shaped like the MongoDB rollup documents
+def rollup_frame(raw, granularity):
+    rollup = ROLLUPS[granularity]
+    raw = raw.sort_values(TIME_FIELD, kind="stable")
+    raw = raw.assign(bucket=raw[TIME_FIELD].dt.floor(f"{rollup['bin_size']}{_ROLLUP_FREQ[rollup['unit']]}"))
+    grouped = raw.groupby(["UID", "bucket"], sort=True)
+
+    last = raw.drop_duplicates(["UID", "bucket"], keep="last").set_index(["UID", "bucket"])
+    frame = last[["MAX_block_number", *ROLLUP_FIELDS]].sort_index()
+    frame = frame.join(grouped[ROLLUP_FIELDS].min().add_suffix("_min"))
+    frame = frame.join(grouped[ROLLUP_FIELDS].max().add_suffix("_max"))
+    frame["samples"] = grouped.size()
+    return frame.reset_index().rename(columns={"bucket": TIME_FIELD})
+
+
+# Local store of day-partitioned Parquet files, laid out like the archive:
+# <root>/<collection>/subnet=<netuid>/date=<YYYY-MM-DD>/rank_records.parquet,
+# with rank_records for raw records and rank_rollup_* for each rollup.
+# Reads memory-map the day files and decode straight into columnar frames.
+class ParquetRankBackend(RankBackend):
+    def __init__(self, root):
+        self.root = root
+        self.name = f"parquet:{root}"
+        self._write_lock = threading.Lock()
+
+    def _path(self, collection, subnet, day):
+        return archive_path(os.path.join(self.root, collection), subnet, day)
+
+    def _read_day(self, collection, subnet, day, uids=None):
+        path = self._path(collection, subnet, day)
+        if not os.path.exists(path):
+            return None
+        table = pq.read_table(path, memory_map=True)
+        if uids is not None:
+            table = table.filter(pc.is_in(table["UID"], value_set=pa.array(list(uids), type=table.schema.field("UID").type)))
+        return table
+
+    # Long records (one row per UID and timestamp) over [since, until). Bounds are
+    # truncated to milliseconds, as BSON truncates them in MongoDB queries.
+    def _read_long(self, collection, subnet, uids, since, until=None):
+        since = _naive_utc(since).floor("ms")
+        until = _naive_utc(until).floor("ms") if until is not None else None
+        last_day = until if until is not None else _naive_utc(datetime.now(timezone.utc))
+        tables = []
+        day = _day(since)
+        while day <= last_day:
+            table = self._read_day(collection, subnet, day, uids)
+            if table is not None and table.num_rows:
+                tables.append(table)
+            day += timedelta(days=1)
+        if not tables:
+            return pd.DataFrame()
+
+        records = pa.concat_tables(tables, promote_options="default").to_pandas()
+        in_range = records[TIME_FIELD] >= since
+        if until is not None:
+            in_range &= records[TIME_FIELD] < until
+        return records[in_range]
+
+    def _read_frame(self, collection, subnet, uids, since, until=None):
+        records = self._read_long(collection, subnet, uids, since, until)
+        if records.empty:
+            return pd.DataFrame()
+        return wide_rank_frame(records, uids)
+
+    # Rewrite the rollups of one day from its raw records
+    def _write_rollups(self, subnet, day, raw):
+        for granularity, rollup in ROLLUPS.items():
+            write_partition(rollup_frame(raw, granularity), self._path(rollup["collection"], subnet, day))
+
+    def write_records(self, subnet, records):
+        if not records:
+            return 0, 0
+        new = pd.DataFrame([{k: v for k, v in record.items() if k != "_id"} for record in records])
+        new[TIME_FIELD] = _naive_utc_ms(new[TIME_FIELD])
+
+        inserted = 0
+        with self._write_lock:
+            for day, day_records in new.groupby(new[TIME_FIELD].dt.floor("D")):
+                day = day.to_pydatetime()
+                existing = self._read_day(RANK_COLLECTION, subnet, day)
+                stored = 0 if existing is None else existing.num_rows
+                raw = day_records if existing is None else pd.concat([existing.to_pandas(), day_records], ignore_index=True)
+                raw = raw.drop_duplicates(RECORD_KEY, keep="first").sort_values([TIME_FIELD, "UID"], kind="stable")
+                if len(raw) == stored:
+                    continue
+                inserted += len(raw) - stored
+                write_partition(raw, self._path(RANK_COLLECTION, subnet, day))
+                self._write_rollups(subnet, day, raw)
+        return inserted, len(records) - inserted
+
+    def read_records(self, subnet, uids, since, until=None):
+        return self._read_frame(RANK_COLLECTION, subnet, uids, since, until)
+
+    def read_rollups(self, granularity, subnet, uids, since, until=None):
+        return self._read_frame(ROLLUPS[granularity]["collection"], subnet, uids, since, until)
+
+    def read_latest(self, subnet, uids, since):
+        records = self._read_long(RANK_COLLECTION, subnet, uids, since)
+        if records.empty:
+            return {}
+        latest = records.sort_values(TIME_FIELD, kind="stable").drop_duplicates("UID", keep="last")
+        latest = latest.astype(object).where(latest.notna(), None)
+        return {int(record["UID"]): record for record in latest.to_dict("records")}
+
+    def rebuild_rollups(self, subnet):
+        subnet_dir = os.path.dirname(os.path.dirname(self._path(RANK_COLLECTION, subnet, datetime(1970, 1, 1))))
+        if not os.path.isdir(subnet_dir):
+            return
+        with self._write_lock:
+            for partition in sorted(os.listdir(subnet_dir)):
+                day = datetime.strptime(partition, "date=%Y-%m-%d")
+                table = self._read_day(RANK_COLLECTION, subnet, day)
+                if table is not None and table.num_rows:
+                    self._write_rollups(subnet, day, table.to_pandas())
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+# The process-wide rank backend, chosen by RANK_BACKEND ("mongo" or "parquet");
+# the Parquet backend stores its files under RANK_DATA_DIR
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            kind = get_setting("RANK_BACKEND", DEFAULT_BACKEND)
+            if kind == "mongo":
+                _backend = MongoRankBackend(get_client())
+            elif kind == "parquet":
+                _backend = ParquetRankBackend(get_setting("RANK_DATA_DIR", DEFAULT_DATA_DIR))
+            else:
+                raise ValueError(f"Unknown RANK_BACKEND {kind!r}; expected 'mongo' or 'parquet'")
+        return _backend
+
+
+# Use backend for the rest of the process instead of the configured one
+def set_backend(backend):
+    global _backend
+    with _backend_lock:
+        _backend = backend
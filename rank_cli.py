@@ -0,0 +1,137 @@
+import argparse
+from datetime import datetime, timezone
+
+import backfill as backfill_module
+import ingest
+from mongo_connection import get_client
+from rank_backend import get_backend
+from rank_retention import apply_retention, archive_subnet
+from rank_store import migrate_legacy_collections
+from subnet_registry import load_subnets
+
+
+# Copy the legacy rank_sn*_UID_* collections into the time-series collection
+def migrate(args):
+    client = get_client()
+    subnets = args.subnet or [netuid for netuid, config in load_subnets().items() if config["legacy_database"]]
+    for subnet in subnets:
+        legacy_database = load_subnets()[subnet]["legacy_database"]
+        if not legacy_database:
+            print(f"SN{subnet}: no legacy_database configured, skipping")
+            continue
+        inserted, skipped = migrate_legacy_collections(client, subnet, legacy_database, batch_size=args.batch_size)
+        print(f"SN{subnet}: {inserted} records copied, {skipped} already present")
+
+
+# Recompute the 5m/1h/1d rollups from the raw records, e.g. after a migration
+def rollup(args):
+    backend = get_backend()
+    for subnet in args.subnet or list(load_subnets()):
+        backend.rebuild_rollups(subnet)
+        print(f"SN{subnet}: rollups rebuilt")
+
+
+# Apply the configured expiry to the raw records and rollups
+def retention(args):
+    for collection, seconds in apply_retention(get_client()).items():
+        kept = "forever" if seconds is None else f"{seconds / 86400:g} days"
+        print(f"{collection}: records kept {kept}")
+
+
+# Export complete days of raw records to Parquet before they expire
+def archive(args):
+    client = get_client()
+    for subnet in args.subnet or list(load_subnets()):
+        days = archive_subnet(client, subnet, root=args.out, overwrite=args.overwrite)
+        for day, rows in days:
+            print(f"SN{subnet} {day:%Y-%m-%d}: {rows} records archived")
+        if not days:
+            print(f"SN{subnet}: nothing to archive")
+
+
+# Poll the taostats metagraph and store rank records, outside the web app
+def run_ingest(args):
+    ok = ingest.run(get_backend(), subnets=args.subnet, interval=args.interval, once=args.once)
+    if not ok:
+        raise SystemExit(1)
+
+
+# Unix seconds of an ISO 8601 date or datetime, read as UTC when it has no offset
+def _unix_time(value):
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+# Fetch historical metagraph snapshots over a block or time range and store their rank records
+def backfill(args):
+    if args.blocks:
+        kind, (start, end) = "block", args.blocks
+    else:
+        until = _unix_time(args.until) if args.until else int(datetime.now(timezone.utc).timestamp())
+        kind, start, end = "time", _unix_time(args.since), until
+    inserted, skipped, failed = backfill_module.backfill(
+        get_backend(), args.subnet, kind, start, end,
+        step=args.step, workers=args.workers, checkpoint_dir=args.checkpoint_dir,
+    )
+    print(f"SN{args.subnet}: {inserted} records inserted, {skipped} already stored")
+    if failed:
+        print(f"SN{args.subnet}: {len(failed)} chunks failed; re-run the same command to retry them")
+        raise SystemExit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank data maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="copy per-UID rank collections into the time-series collection")
+    migrate_parser.add_argument("--subnet", type=int, action="append", choices=list(load_subnets()),
+                                help="subnet to migrate (repeatable; default: all)")
+    migrate_parser.add_argument("--batch-size", type=int, default=1000)
+    migrate_parser.set_defaults(handler=migrate)
+
+    rollup_parser = commands.add_parser("rollup", help="rebuild the rank rollups from raw records")
+    rollup_parser.add_argument("--subnet", type=int, action="append", choices=list(load_subnets()),
+                               help="subnet to rebuild (repeatable; default: all)")
+    rollup_parser.set_defaults(handler=rollup)
+
+    retention_parser = commands.add_parser("retention", help="apply the configured expiry to rank collections")
+    retention_parser.set_defaults(handler=retention)
+
+    archive_parser = commands.add_parser("archive", help="export complete days of raw records to Parquet")
+    archive_parser.add_argument("--subnet", type=int, action="append", choices=list(load_subnets()),
+                                help="subnet to archive (repeatable; default: all)")
+    archive_parser.add_argument("--out", help="archive root directory (default: RANK_ARCHIVE_DIR or rank_archive)")
+    archive_parser.add_argument("--overwrite", action="store_true", help="re-export days already archived")
+    archive_parser.set_defaults(handler=archive)
+
+    ingest_parser = commands.add_parser("ingest", help="poll each subnet and store rank records")
+    ingest_parser.add_argument("--subnet", type=int, action="append", choices=list(load_subnets()),
+                               help="subnet to poll (repeatable; default: all)")
+    ingest_parser.add_argument("--interval", type=int, default=ingest.POLL_INTERVAL,
+                               help="seconds between polls of a subnet until its epoch timing is known")
+    ingest_parser.add_argument("--once", action="store_true", help="poll once and exit")
+    ingest_parser.set_defaults(handler=run_ingest)
+
+    backfill_parser = commands.add_parser("backfill", help="store rank records from historical metagraph snapshots")
+    backfill_parser.add_argument("--subnet", type=int, required=True, choices=list(load_subnets()))
+    backfill_range = backfill_parser.add_mutually_exclusive_group(required=True)
+    backfill_range.add_argument("--blocks", type=int, nargs=2, metavar=("START", "END"),
+                                help="inclusive block range")
+    backfill_range.add_argument("--since", help="start of a time range (ISO 8601, UTC by default)")
+    backfill_parser.add_argument("--until", help="end of the time range (default: now)")
+    backfill_parser.add_argument("--step", type=int,
+                                 help="blocks or seconds per chunk (default: 300 blocks or 3600 seconds)")
+    backfill_parser.add_argument("--workers", type=int, default=backfill_module.DEFAULT_WORKERS,
+                                 help="chunks fetched in parallel, within the API key's rate limit")
+    backfill_parser.add_argument("--checkpoint-dir",
+                                 help="where progress is kept (default: BACKFILL_CHECKPOINT_DIR or backfill)")
+    backfill_parser.set_defaults(handler=backfill)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+# Sorted reward arrays of one metagraph snapshot. Built once per snapshot
+# (O(n log n)); rank and risk queries for any number of rewards are then binary
+# searches, O(log n) each. Missing rewards are left out of the arrays, and a
+# missing query reward gets rank and risk 0.
+class SnapshotRanks:
+    def __init__(self, rewards, is_validator, is_immune):
+        rewards = np.asarray(rewards, dtype="float64")
+        present = ~np.isnan(rewards)
+        self.miner_rewards = np.sort(rewards[present & ~np.asarray(is_validator, dtype=bool)])
+        self.non_immune_rewards = np.sort(rewards[present & ~np.asarray(is_immune, dtype=bool)])
+
+    @staticmethod
+    def _queries(rewards):
+        rewards = np.asarray(rewards, dtype="float64")
+        return rewards, np.isnan(rewards)
+
+    # Non-validators earning more than each reward (0 for the top miner)
+    def miner_rank(self, rewards):
+        rewards, missing = self._queries(rewards)
+        greater = len(self.miner_rewards) - np.searchsorted(self.miner_rewards, rewards, side="right")
+        return np.where(missing, 0, greater)
+
+    # Non-immune neurons earning less than each reward (0 for the next to be deregistered)
+    def deregister_risk(self, rewards):
+        rewards, missing = self._queries(rewards)
+        return np.where(missing, 0, np.searchsorted(self.non_immune_rewards, rewards, side="left"))
+
+    # Percent of non-validators earning at most each reward
+    def percentile(self, rewards):
+        rewards, missing = self._queries(rewards)
+        if not len(self.miner_rewards):
+            return np.full(rewards.shape, np.nan)
+        at_most = np.searchsorted(self.miner_rewards, rewards, side="right")
+        return np.where(missing, np.nan, 100 * at_most / len(self.miner_rewards))
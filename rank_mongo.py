@@ -0,0 +1,222 @@
+import logging
+import streamlit as st
+import pandas as pd
+import altair as alt
+from instrumentation import CHART, STORAGE, measure
+from metagraph import load_metagraph
+from rank_backend import STORAGE_ERRORS, get_backend
+from rank_pipeline import compute_rank_records
+from rank_rollups import CHART_WINDOWS
+from rank_window import read_rank_window
+from snapshot_fingerprint import UNCHANGED, changed_snapshot, remember
+from subnet_registry import get_subnet
+from trend_signals import STATE_LOOKBACK, apply_trends, save_trends
+
+logger = logging.getLogger(__name__)
+
+
+# Process and save data for all tracked UIDs from one metagraph snapshot;
+# returns the (inserted, skipped) record counts, or UNCHANGED without parsing,
+# ranking or writing when the snapshot matches the last one processed
+def process_and_save_data(netuid, data):
+    snapshot = changed_snapshot(netuid, data)
+    if snapshot is None:
+        return UNCHANGED
+
+    records = compute_rank_records(data, get_subnet(netuid)["uids"])
+
+    # Continue each UID's trend signals from its previous record, stored with the new ones
+    trends = apply_trends(get_backend(), netuid, records)
+
+    # Save data to the configured backend, which refreshes the rollup buckets the new records fall into
+    with measure(STORAGE, f"write records sn{netuid}") as size:
+        inserted, skipped = get_backend().write_records(netuid, records)
+        size["documents"] = inserted
+    save_trends(trends)
+    remember(netuid, snapshot)
+    return inserted, skipped
+
+
+# Plot data for all UIDs
+
+# Wide frame of the chart window for all UIDs, refreshed incrementally from the
+# process-wide window cache. Short windows read raw records; longer ones read the
+# matching rollup so the number of points stays bounded.
+def create_combined_df(netuid, window="6h"):
+    config = CHART_WINDOWS[window]
+    with measure(STORAGE, f"read {window} sn{netuid}") as size:
+        combined_df = read_rank_window(
+            get_backend(), netuid, get_subnet(netuid)["uids"], config["span"], granularity=config["rollup"]
+        )
+        size["documents"] = len(combined_df)
+        size["bytes"] = int(combined_df.memory_usage(index=False).sum())
+
+    if combined_df.empty:
+        st.warning("No data available to combine.")
+    return combined_df
+
+
+def prepare_chart_data(combined_df):
+    if combined_df.empty:
+        return pd.DataFrame()
+
+    # Scale values for better readability
+    chart_df = combined_df.copy()
+    for column in chart_df.columns:
+        if column not in ["MAX_timestamp"] and not column.startswith("Miner_Rank_UID") and not column.startswith("Deregister_Risk_UID"):
+            chart_df[column] /= 1_000_000_000
+
+    # The chart folds the value columns into Metric/Value rows in the browser, so the
+    # frame stays wide and each rank/risk value is shipped once per timestamp
+    return chart_df
+
+
+def generate_chart(chart_df, dynamic_uids):
+    # Ensure the DataFrame is not empty
+    if chart_df.empty:
+        st.warning("No data available to plot.")
+        return
+    
+
+    # Define custom colors for key metrics
+    custom_colors = {
+        "Min Miner": "#ff7f0e",  # Orange
+        "Min Non-Immune": "#d62728",  # Red
+        "Max Miner": "transparent",  # Blue
+    }
+
+    light_colors = [
+        "#f0ead2",
+        "#656d4a",
+        "#adc178",
+        "#7f4f24",
+        "#582f0e",
+        "#5a189a",
+        "#9d4edd"
+        ]
+    
+    uid_colors = {
+        f"UID {uid}": light_colors[i % len(light_colors)] for i, uid in enumerate(dynamic_uids)
+    }
+
+    # Combine the predefined colors and dynamically generated UID colors
+    custom_colors.update(uid_colors)
+
+    # One shared dataset: the wide frame, folded into Metric/Value client-side
+    value_columns = [column for column in custom_colors if column in chart_df.columns]
+    base = alt.Chart(chart_df).transform_fold(value_columns, as_=["Metric", "Value"])
+
+    # Base line chart for all metrics
+    base_chart = base.mark_line(point=False).encode(
+        x=alt.X("MAX_timestamp:T", title="Timestamp"),
+        y=alt.Y("Value:Q", title="Rewards"),
+        #color="Metric:N",
+        color=alt.Color(
+            "Metric:N",
+            title="Metric",
+            scale=alt.Scale(domain=list(custom_colors.keys()), range=list(custom_colors.values()))
+
+        ),
+        tooltip=[
+            alt.Tooltip("Metric:N", title="Metric"),
+            alt.Tooltip("Value:Q", title="Reward Value"),
+        ]
+    )
+
+    # A single tooltip layer for every UID: each point looks up the rank and risk
+    # columns of its own UID
+    uid_chart = base.transform_filter(
+        "indexof(datum.Metric, 'UID ') === 0"
+    ).transform_calculate(
+        uid="replace(datum.Metric, 'UID ', '')"
+    ).transform_calculate(
+        Miner_Rank="datum['Miner_Rank_UID' + datum.uid]",
+        Deregister_Risk="datum['Deregister_Risk_UID' + datum.uid]",
+    ).mark_point().encode(
+        x=alt.X("MAX_timestamp:T"),
+        y=alt.Y("Value:Q"),
+        color=alt.value("transparent"),  # Set a specific color for the point
+        tooltip=[
+            alt.Tooltip("Metric:N", title="Metric"),
+            alt.Tooltip("Value:Q", title="Reward Value"),
+            alt.Tooltip("Miner_Rank:Q", title="Miner Rank"),
+            alt.Tooltip("Deregister_Risk:Q", title="Deregister Risk"),
+        ]
+    )
+
+    combined_chart = (base_chart + uid_chart).properties(width=1600, height=400).interactive()
+
+    # Measure and log the spec shipped to the browser, so payload growth is visible
+    spec_bytes = len(combined_chart.to_json(indent=None))
+    logger.info("rank chart spec: %d bytes, %d rows, %d UIDs", spec_bytes, len(chart_df), len(dynamic_uids))
+    st.session_state.setdefault("chart_spec_bytes", {})[tuple(dynamic_uids)] = spec_bytes
+
+    # Render the chart in Streamlit
+    st.altair_chart(combined_chart, use_container_width=True)
+    return spec_bytes
+
+
+# Latest trend signals of each UID, as maintained by the ingestion process
+def display_trend_signals(netuid):
+    uids = get_subnet(netuid)["uids"]
+    since = pd.Timestamp.now(tz="UTC").tz_localize(None) - STATE_LOOKBACK
+    with measure(STORAGE, f"read trends sn{netuid}") as size:
+        latest = get_backend().read_latest(netuid, uids, since)
+        size["documents"] = len(latest)
+
+    rows = []
+    for uid in uids:
+        record = latest.get(uid)
+        if record is None or record.get("EWMA_daily_reward") is None:
+            continue
+        margin = record.get("MARGIN_NON_IMMUNE_daily_reward")
+        margin_slope = record.get("SLOPE_MARGIN_NON_IMMUNE_per_hour")
+        rows.append({
+            "UID": uid,
+            "Percentile": record.get("PERCENTILE_NON_VALI_daily_reward"),
+            "Reward EWMA (τ)": record["EWMA_daily_reward"] / 1_000_000_000,
+            "Deregister Risk": record["COUNT_NON_IMMUNE_daily_reward_less_UID"],
+            "Risk slope (/h)": record["SLOPE_Deregister_Risk_per_hour"],
+            "Margin over Min Non-Immune (τ)": margin / 1_000_000_000 if margin is not None else None,
+            "Margin slope (τ/h)": margin_slope / 1_000_000_000 if margin_slope is not None else None,
+            "Hours to threshold": record.get("HOURS_TO_DEREGISTER_threshold"),
+        })
+    if rows:
+        st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+
+# Ingestion for all UIDs of a subnet; run by the ingestion process (rank_cli.py ingest), never by the page.
+# Request errors propagate so the poll scheduler can back off.
+def ingest_subnet(netuid):
+    data = load_metagraph(netuid, fresh=True)
+    if not data:
+        return None
+    return process_and_save_data(netuid, data)
+
+
+# Display data for all UIDs
+
+def display_rank_mongo(netuid):
+    window = st.radio("Window", list(CHART_WINDOWS), horizontal=True, key=f"rank_window_sn{netuid}")
+
+    # Create the combined DataFrame for the selected window
+    try:
+        combined_df = create_combined_df(netuid, window)
+    except STORAGE_ERRORS as e:
+        st.error(f"Failed to load rank data: {e}")
+        return
+
+    # Prepare the data for plotting
+    with measure(CHART, "prepare_chart_data") as size:
+        chart_df = prepare_chart_data(combined_df)
+        size["documents"] = len(chart_df)
+
+    # Generate and display the chart
+    with measure(CHART, "generate_chart") as size:
+        size["bytes"] = generate_chart(chart_df, get_subnet(netuid)["uids"]) or 0
+
+    # Trend signals precomputed at ingest time
+    try:
+        display_trend_signals(netuid)
+    except STORAGE_ERRORS as e:
+        st.error(f"Failed to load trend signals: {e}")
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from rank_engine import SnapshotRanks
+
+SNAPSHOT_COLUMNS = ["uid", "block_number", "timestamp", "daily_reward", "is_immunity_period", "validator_trust"]
+
+
+# Parse a metagraph payload once into a typed DataFrame
+def parse_snapshot(data):
+    df = pd.DataFrame(data, columns=SNAPSHOT_COLUMNS)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601")
+    df["uid"] = df["uid"].astype("int64")
+    df["block_number"] = df["block_number"].astype("int64")
+    df["daily_reward"] = df["daily_reward"].astype("float64")
+    df["is_immunity_period"] = df["is_immunity_period"].astype(bool)
+    df["is_validator"] = df["validator_trust"].astype(str) != "0"
+    return df.drop(columns="validator_trust")
+
+
+def snapshot_ranks(snapshot):
+    return SnapshotRanks(
+        snapshot["daily_reward"].to_numpy(),
+        snapshot["is_validator"].to_numpy(),
+        snapshot["is_immunity_period"].to_numpy(),
+    )
+
+
+def _optional_float(value):
+    return None if pd.isna(value) else float(value)
+
+
+# Compute the rank records of every tracked UID from one metagraph snapshot
+def compute_rank_records(data, uids):
+    if not data:
+        return []
+
+    try:
+        df = parse_snapshot(data)
+    except (ValueError, TypeError) as e:
+        st.warning(f"Failed to parse timestamps: {e}")
+        return []
+
+    # Tracked rows only; warn once for UIDs missing from the whole payload
+    tracked_rows = df[df["uid"].isin(uids)]
+    present = set(tracked_rows["uid"].tolist())
+    for uid in uids:
+        if uid not in present:
+            st.warning(f"No data found for UID {uid}")
+    if not present:
+        return []
+
+    # Subnet-wide statistics for each (block, timestamp) group
+    reward = df["daily_reward"]
+    df["non_immune_reward"] = reward.where(~df["is_immunity_period"])
+    df["non_vali_reward"] = reward.where(~df["is_validator"])
+    grouper = df.groupby(["block_number", "timestamp"], sort=True)
+    stats = grouper.agg(
+        MIN_daily_reward=("daily_reward", "min"),
+        MIN_NON_IMMUNE_daily_reward=("non_immune_reward", "min"),
+        MAX_NON_VALI_daily_reward=("non_vali_reward", "max"),
+    )
+
+    # Reward and immunity of each tracked UID in each group. A history chunk
+    # holds many blocks, and a UID's reward differs between them, so every group
+    # is ranked against its own rewards.
+    tracked = tracked_rows.groupby(["block_number", "timestamp", "uid"]).agg(
+        DAILY_REWARD=("daily_reward", "max"),
+        IS_IMMUNE=("is_immunity_period", "any"),
+    )
+
+    # Rank and risk counts of the group's tracked UIDs at once: the reward arrays
+    # of each group are sorted once and every UID is a binary search into them
+    by_uid = {}
+    for (block, timestamp), group in grouper:
+        if (block, timestamp) not in tracked.index:
+            continue
+        group_tracked = tracked.loc[(block, timestamp)]
+        uid_rewards = group_tracked["DAILY_REWARD"].to_numpy()
+        ranks = snapshot_ranks(group)
+        has_reward = np.nan_to_num(uid_rewards) != 0
+        greater_counts = (ranks.miner_rank(uid_rewards) * has_reward).tolist()
+        less_counts = (ranks.deregister_risk(uid_rewards) * has_reward).tolist()
+        percentiles = ranks.percentile(uid_rewards).tolist()
+        group_stats = stats.loc[(block, timestamp)]
+
+        # Plain Python values, so the records need no per-row pandas access
+        common = {
+            "MAX_block_number": int(block),
+            "MAX_timestamp": timestamp.to_pydatetime(),
+            "MIN_daily_reward": _optional_float(group_stats["MIN_daily_reward"]),
+            "MIN_NON_IMMUNE_daily_reward": _optional_float(group_stats["MIN_NON_IMMUNE_daily_reward"]),
+            "MAX_NON_VALI_daily_reward": _optional_float(group_stats["MAX_NON_VALI_daily_reward"]),
+        }
+        for uid, uid_reward, immune, greater, less, percentile in zip(
+            group_tracked.index.tolist(), uid_rewards.tolist(), group_tracked["IS_IMMUNE"].tolist(),
+            greater_counts, less_counts, percentiles,
+        ):
+            by_uid.setdefault(uid, []).append({
+                "UID": int(uid),
+                "MAX_block_number": common["MAX_block_number"],
+                "MAX_timestamp": common["MAX_timestamp"],
+                "DAILY_REWARD": uid_reward,
+                "IS_IMMUNE": bool(immune),
+                "MIN_daily_reward": common["MIN_daily_reward"],
+                "MIN_NON_IMMUNE_daily_reward": common["MIN_NON_IMMUNE_daily_reward"],
+                "MAX_NON_VALI_daily_reward": common["MAX_NON_VALI_daily_reward"],
+                "COUNT_NON_VALI_daily_reward_greater_UID": greater,
+                "COUNT_NON_IMMUNE_daily_reward_less_UID": less,
+                "PERCENTILE_NON_VALI_daily_reward": _optional_float(percentile),
+            })
+
+    # Records of each tracked UID in registry order, oldest group first
+    return [record for uid in uids for record in by_uid.get(uid, [])]
@@ -0,0 +1,164 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+from pymongo import ASCENDING
+
+from rank_rollups import ROLLUPS, bucket_start, get_rollup_collection, update_rollups
+from rank_store import (
+    FRAME_STAT_COLUMNS,
+    META_FIELD,
+    RANK_COLLECTION,
+    RANK_DB_NAME,
+    TIME_FIELD,
+    get_rank_collection,
+)
+from settings import get_setting
+
+# Days each collection keeps its records, by setting name and default;
+# 0 or empty keeps records forever
+RAW_RETENTION_SETTING = ("RANK_RETENTION_DAYS", 7)
+ROLLUP_RETENTION_SETTINGS = {
+    "5m": ("RANK_ROLLUP_5M_RETENTION_DAYS", 30),
+    "1h": ("RANK_ROLLUP_1H_RETENTION_DAYS", 180),
+    "1d": ("RANK_ROLLUP_1D_RETENTION_DAYS", 0),
+}
+
+# Raw records must outlive at least one full day so the archive can export it
+MIN_RAW_RETENTION_DAYS = 2
+
+TTL_INDEX_NAME = "ttl"
+
+# A day whose first raw records expire within this margin no longer counts as
+# complete, so it does not lose records while it is read
+EXPIRY_MARGIN = timedelta(hours=1)
+
+# Day-partitioned Parquet archive of raw rank records
+DEFAULT_ARCHIVE_DIR = "rank_archive"
+ARCHIVE_FILE = "rank_records.parquet"
+ARCHIVE_COMPRESSION = "zstd"
+# Reward columns are always written as floats, so a day with only missing
+# values keeps the same schema as the others
+ARCHIVE_FLOAT_FIELDS = ["DAILY_REWARD", *FRAME_STAT_COLUMNS]
+
+
+def _retention_seconds(setting):
+    name, default = setting
+    value = get_setting(name, default)
+    if value in (None, ""):
+        return None
+    days = float(value)
+    if days <= 0:
+        return None
+    return int(days * 86400)
+
+
+def raw_retention_seconds():
+    seconds = _retention_seconds(RAW_RETENTION_SETTING)
+    if seconds is not None and seconds < MIN_RAW_RETENTION_DAYS * 86400:
+        raise ValueError(f"{RAW_RETENTION_SETTING[0]} must be at least {MIN_RAW_RETENTION_DAYS} days")
+    return seconds
+
+
+def rollup_retention_seconds(granularity):
+    return _retention_seconds(ROLLUP_RETENTION_SETTINGS[granularity])
+
+
+# First day (naive UTC) whose raw records are all still stored, or None when raw
+# records never expire. Earlier days may have lost records to expiry: their
+# rollups must not be recomputed from what is left, nor the rest archived.
+def first_complete_day(now=None):
+    seconds = raw_retention_seconds()
+    if seconds is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(seconds=seconds) + EXPIRY_MARGIN).astimezone(timezone.utc).replace(tzinfo=None)
+    day = bucket_start(cutoff, "1d")
+    return day if day == cutoff else day + timedelta(days=1)
+
+
+# Apply the configured expiry to the raw time-series collection (its
+# expireAfterSeconds option) and to each rollup (a TTL index on MAX_timestamp);
+# returns {collection name: seconds or None}
+def apply_retention(client):
+    db = client[RANK_DB_NAME]
+    get_rank_collection(client)
+    applied = {}
+
+    seconds = raw_retention_seconds()
+    db.command("collMod", RANK_COLLECTION, expireAfterSeconds=seconds if seconds is not None else "off")
+    applied[RANK_COLLECTION] = seconds
+
+    for granularity, rollup in ROLLUPS.items():
+        collection = get_rollup_collection(client, granularity)
+        seconds = rollup_retention_seconds(granularity)
+        index = collection.index_information().get(TTL_INDEX_NAME)
+        if seconds is None:
+            if index is not None:
+                collection.drop_index(TTL_INDEX_NAME)
+        elif index is None:
+            collection.create_index([(TIME_FIELD, ASCENDING)], name=TTL_INDEX_NAME, expireAfterSeconds=seconds)
+        elif index.get("expireAfterSeconds") != seconds:
+            db.command("collMod", rollup["collection"], index={"name": TTL_INDEX_NAME, "expireAfterSeconds": seconds})
+        applied[rollup["collection"]] = seconds
+    return applied
+
+
+def archive_dir():
+    return get_setting("RANK_ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR)
+
+
+def archive_path(root, subnet, day):
+    return os.path.join(root, f"subnet={subnet}", f"date={day:%Y-%m-%d}", ARCHIVE_FILE)
+
+
+# Write a day partition atomically: to a temporary name, then renamed into place
+def write_partition(frame, path):
+    frame = frame.astype({field: "float64" for field in ARCHIVE_FLOAT_FIELDS if field in frame.columns})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.partial"
+    frame.to_parquet(partial, index=False, compression=ARCHIVE_COMPRESSION)
+    os.replace(partial, path)
+
+
+# Write one day of a subnet's raw records to a Parquet file; returns the row count
+def export_day(collection, subnet, day, path):
+    documents = list(
+        collection.find(
+            {"meta.subnet": subnet, TIME_FIELD: {"$gte": day, "$lt": day + timedelta(days=1)}},
+            {"_id": 0, META_FIELD: 0},
+        ).sort([(TIME_FIELD, ASCENDING), ("UID", ASCENDING)])
+    )
+    if not documents:
+        return 0
+
+    frame = pd.DataFrame(documents)
+    write_partition(frame, path)
+    return len(frame)
+
+
+# Export every complete day of a subnet's raw records that is not archived yet,
+# after bringing the rollups of those days up to date; returns [(day, rows)].
+# Days that may have partly expired are left alone.
+def archive_subnet(client, subnet, root=None, overwrite=False):
+    root = root or archive_dir()
+    collection = get_rank_collection(client)
+    oldest = collection.find_one({"meta.subnet": subnet}, {TIME_FIELD: 1}, sort=[(TIME_FIELD, ASCENDING)])
+    if oldest is None:
+        return []
+
+    today = bucket_start(datetime.now(timezone.utc), "1d")
+    day = bucket_start(oldest[TIME_FIELD], "1d")
+    complete = first_complete_day()
+    if complete is not None:
+        day = max(day, complete)
+    pending = []
+    while day < today:
+        if overwrite or not os.path.exists(archive_path(root, subnet, day)):
+            pending.append(day)
+        day += timedelta(days=1)
+    if not pending:
+        return []
+
+    update_rollups(client, subnet, pending[0], pending[-1] + timedelta(days=1) - timedelta(milliseconds=1))
+    return [(day, export_day(collection, subnet, day, archive_path(root, subnet, day))) for day in pending]
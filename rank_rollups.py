@@ -0,0 +1,125 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING
+
+from rank_store import META_FIELD, RANK_DB_NAME, RANK_COLLECTION, TIME_FIELD
+
+# Rollup granularities: collection name and $dateTrunc unit/binSize
+ROLLUPS = {
+    "5m": {"collection": "rank_rollup_5m", "unit": "minute", "bin_size": 5},
+    "1h": {"collection": "rank_rollup_1h", "unit": "hour", "bin_size": 1},
+    "1d": {"collection": "rank_rollup_1d", "unit": "day", "bin_size": 1},
+}
+
+# Fields summarised in each bucket. The last value keeps the raw field name, so
+# rollup documents can be read with the same frame pipeline as raw records;
+# min and max are stored as <field>_min and <field>_max.
+ROLLUP_FIELDS = [
+    "DAILY_REWARD",
+    "MIN_daily_reward",
+    "MIN_NON_IMMUNE_daily_reward",
+    "MAX_NON_VALI_daily_reward",
+    "COUNT_NON_VALI_daily_reward_greater_UID",
+    "COUNT_NON_IMMUNE_daily_reward_less_UID",
+]
+
+# Chart windows: span and the data they read (None for raw records)
+CHART_WINDOWS = {
+    "6h": {"span": timedelta(hours=6), "rollup": None},
+    "24h": {"span": timedelta(hours=24), "rollup": "5m"},
+    "7d": {"span": timedelta(days=7), "rollup": "1h"},
+    "30d": {"span": timedelta(days=30), "rollup": "1d"},
+}
+
+_ready = set()
+_ready_lock = threading.Lock()
+
+
+def ensure_rollup_indexes(db):
+    key = (id(db.client), db.name)
+    with _ready_lock:
+        if key in _ready:
+            return
+        for rollup in ROLLUPS.values():
+            collection = db[rollup["collection"]]
+            collection.create_index(
+                [("meta.subnet", ASCENDING), ("meta.uid", ASCENDING), (TIME_FIELD, ASCENDING)],
+                name="subnet_uid_time",
+            )
+            collection.create_index([("meta.subnet", ASCENDING), (TIME_FIELD, ASCENDING)], name="subnet_time")
+        _ready.add(key)
+
+
+def get_rollup_collection(client, granularity):
+    db = client[RANK_DB_NAME]
+    ensure_rollup_indexes(db)
+    return db[ROLLUPS[granularity]["collection"]]
+
+
+# Start of the bucket containing timestamp (UTC)
+def bucket_start(timestamp, granularity):
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    rollup = ROLLUPS[granularity]
+    if rollup["unit"] == "minute":
+        minute = timestamp.minute - timestamp.minute % rollup["bin_size"]
+        return timestamp.replace(minute=minute, second=0, microsecond=0)
+    if rollup["unit"] == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# Start of the bucket after the one containing timestamp (UTC)
+def bucket_end(timestamp, granularity):
+    rollup = ROLLUPS[granularity]
+    step = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}[rollup["unit"]]
+    return bucket_start(timestamp, granularity) + step * rollup["bin_size"]
+
+
+# Recompute the buckets of a subnet from the one containing since to the one
+# containing until (to the newest when until is None) and $merge them into the rollup
+def rollup_pipeline(subnet, granularity, since, until=None):
+    rollup = ROLLUPS[granularity]
+    group = {
+        "_id": {
+            "subnet": f"${META_FIELD}.subnet",
+            "uid": f"${META_FIELD}.uid",
+            "bucket": {"$dateTrunc": {"date": f"${TIME_FIELD}", "unit": rollup["unit"], "binSize": rollup["bin_size"]}},
+        },
+        "MAX_block_number": {"$last": "$MAX_block_number"},
+        "samples": {"$sum": 1},
+    }
+    for field in ROLLUP_FIELDS:
+        group[field] = {"$last": f"${field}"}
+        group[f"{field}_min"] = {"$min": f"${field}"}
+        group[f"{field}_max"] = {"$max": f"${field}"}
+
+    time_range = {"$gte": bucket_start(since, granularity)}
+    if until is not None:
+        time_range["$lt"] = bucket_end(until, granularity)
+    return [
+        {"$match": {"meta.subnet": subnet, TIME_FIELD: time_range}},
+        {"$sort": {TIME_FIELD: 1}},
+        {"$group": group},
+        {"$set": {
+            META_FIELD: {"subnet": "$_id.subnet", "uid": "$_id.uid"},
+            "UID": "$_id.uid",
+            TIME_FIELD: "$_id.bucket",
+        }},
+        {"$merge": {"into": rollup["collection"], "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+# Bring every rollup of a subnet up to date with raw records written between
+# since and until (inclusive); only the buckets covering that range are recomputed
+def update_rollups(client, subnet, since, until=None):
+    db = client[RANK_DB_NAME]
+    ensure_rollup_indexes(db)
+    for granularity in ROLLUPS:
+        db[RANK_COLLECTION].aggregate(rollup_pipeline(subnet, granularity, since, until))
+
+
+# Rebuild all rollups of a subnet from the raw records still stored
+def rebuild_rollups(client, subnet, since=None):
+    update_rollups(client, subnet, since or datetime(1970, 1, 1))
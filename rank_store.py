@@ -0,0 +1,203 @@
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+from pymongo import ASCENDING
+from pymongo.errors import CollectionInvalid
+
+# Consolidated time-series collection holding rank records of every subnet and UID
+RANK_DB_NAME = "rank_database"
+RANK_COLLECTION = "rank_records"
+TIME_FIELD = "MAX_timestamp"
+META_FIELD = "meta"
+
+# Per-UID collections written before consolidation
+LEGACY_COLLECTION_PREFIX = "rank_sn{subnet}_UID_"
+
+_ready = set()
+_ready_lock = threading.Lock()
+
+
+# Create the time-series collection and its secondary index once per process
+def ensure_rank_collection(db):
+    key = (id(db.client), db.name)
+    with _ready_lock:
+        if key in _ready:
+            return
+        if RANK_COLLECTION not in db.list_collection_names():
+            try:
+                db.create_collection(
+                    RANK_COLLECTION,
+                    timeseries={"timeField": TIME_FIELD, "metaField": META_FIELD, "granularity": "minutes"},
+                )
+            except CollectionInvalid:
+                # Another process created it first
+                pass
+        db[RANK_COLLECTION].create_index(
+            [("meta.subnet", ASCENDING), ("meta.uid", ASCENDING), (TIME_FIELD, ASCENDING)],
+            name="subnet_uid_time",
+        )
+        db[RANK_COLLECTION].create_index(
+            [("meta.subnet", ASCENDING), (TIME_FIELD, ASCENDING)],
+            name="subnet_time",
+        )
+        _ready.add(key)
+
+
+def get_rank_collection(client):
+    db = client[RANK_DB_NAME]
+    ensure_rank_collection(db)
+    return db[RANK_COLLECTION]
+
+
+# BSON stores naive UTC datetimes with millisecond precision
+def _stored_timestamp(timestamp):
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp.replace(microsecond=timestamp.microsecond // 1000 * 1000)
+
+
+def _record_key(uid, block_number, timestamp):
+    return int(uid), int(block_number), _stored_timestamp(timestamp)
+
+
+# Insert the records not already stored; returns (inserted, skipped).
+# Time-series collections cannot carry a unique index, so duplicates are
+# filtered with one indexed lookup before a single unordered insert_many.
+def save_rank_records(collection, subnet, records):
+    if not records:
+        return 0, 0
+
+    existing = {
+        _record_key(doc["meta"]["uid"], doc["MAX_block_number"], doc[TIME_FIELD])
+        for doc in collection.find(
+            {
+                "meta.subnet": subnet,
+                "meta.uid": {"$in": sorted({record["UID"] for record in records})},
+                TIME_FIELD: {"$in": sorted({_stored_timestamp(record[TIME_FIELD]) for record in records})},
+            },
+            {"_id": 0, "meta.uid": 1, "MAX_block_number": 1, TIME_FIELD: 1},
+        )
+    }
+
+    documents = []
+    for record in records:
+        key = _record_key(record["UID"], record["MAX_block_number"], record[TIME_FIELD])
+        if key in existing:
+            continue
+        existing.add(key)
+        document = {k: v for k, v in record.items() if k != "_id"}
+        document[META_FIELD] = {"subnet": subnet, "uid": int(record["UID"])}
+        documents.append(document)
+
+    if documents:
+        collection.insert_many(documents, ordered=False)
+    return len(documents), len(records) - len(documents)
+
+
+# Subnet-wide columns of the rank frame, by source field
+FRAME_STAT_COLUMNS = {
+    "MIN_daily_reward": "Min Miner",
+    "MIN_NON_IMMUNE_daily_reward": "Min Non-Immune",
+    "MAX_NON_VALI_daily_reward": "Max Miner",
+}
+
+# Per-UID columns of the rank frame: source field -> column name prefix
+FRAME_UID_COLUMNS = {
+    "DAILY_REWARD": "UID ",
+    "COUNT_NON_VALI_daily_reward_greater_UID": "Miner_Rank_UID",
+    "COUNT_NON_IMMUNE_daily_reward_less_UID": "Deregister_Risk_UID",
+}
+
+
+def _uid_pairs(field, prefix):
+    return {"$push": {"k": {"$concat": [prefix, {"$toString": "$UID"}]}, "v": f"${field}"}}
+
+
+# Aggregation pipeline returning one wide row per MAX_timestamp: the subnet-wide
+# stats plus reward, rank and risk columns for each UID
+def rank_frame_pipeline(subnet, uids, since, until=None):
+    time_range = {"$gte": since}
+    if until is not None:
+        time_range["$lt"] = until
+    group = {"_id": f"${TIME_FIELD}"}
+    for index, field in enumerate(FRAME_STAT_COLUMNS):
+        group[f"stat{index}"] = {"$first": f"${field}"}
+    for index, (field, prefix) in enumerate(FRAME_UID_COLUMNS.items()):
+        group[f"uid{index}"] = _uid_pairs(field, prefix)
+
+    row = {TIME_FIELD: "$_id"}
+    for index, column in enumerate(FRAME_STAT_COLUMNS.values()):
+        row[column] = f"$stat{index}"
+
+    return [
+        {"$match": {"meta.subnet": subnet, "meta.uid": {"$in": list(uids)}, TIME_FIELD: time_range}},
+        {"$project": {"_id": 0, TIME_FIELD: 1, "UID": 1, **{field: 1 for field in FRAME_STAT_COLUMNS},
+                      **{field: 1 for field in FRAME_UID_COLUMNS}}},
+        {"$group": group},
+        {"$replaceRoot": {"newRoot": {"$mergeObjects": [row] + [
+            {"$arrayToObject": f"$uid{index}"} for index in range(len(FRAME_UID_COLUMNS))
+        ]}}},
+        {"$sort": {TIME_FIELD: 1}},
+    ]
+
+
+# Column order of the rank frame for the given UIDs
+def rank_frame_columns(uids):
+    columns = [TIME_FIELD] + list(FRAME_STAT_COLUMNS.values())
+    columns += [f"UID {uid}" for uid in uids]
+    for uid in uids:
+        columns += [f"Miner_Rank_UID{uid}", f"Deregister_Risk_UID{uid}"]
+    return columns
+
+
+# Wide rank frame of a subnet's UIDs over [since, until), from one aggregation
+def read_rank_frame(collection, subnet, uids, since, until=None):
+    rows = list(collection.aggregate(rank_frame_pipeline(subnet, uids, since, until)))
+    if not rows:
+        return pd.DataFrame()
+    frame = pd.DataFrame(rows)
+    frame = frame[[column for column in rank_frame_columns(uids) if column in frame.columns]]
+    frame[TIME_FIELD] = pd.to_datetime(frame[TIME_FIELD])
+    return frame
+
+
+# Latest record of each UID at or after since, as {uid: record}
+def read_latest_records(collection, subnet, uids, since):
+    pipeline = [
+        {"$match": {"meta.subnet": subnet, "meta.uid": {"$in": list(uids)}, TIME_FIELD: {"$gte": since}}},
+        {"$sort": {"meta.uid": 1, TIME_FIELD: -1}},
+        {"$group": {"_id": "$meta.uid", "latest": {"$first": "$$ROOT"}}},
+    ]
+    latest = {}
+    for row in collection.aggregate(pipeline):
+        record = {k: v for k, v in row["latest"].items() if k not in ("_id", META_FIELD)}
+        latest[int(row["_id"])] = record
+    return latest
+
+
+# Copy the legacy per-UID collections of a subnet into the time-series collection;
+# returns (inserted, skipped). Safe to re-run: records already copied are skipped.
+def migrate_legacy_collections(client, subnet, legacy_database, batch_size=1000):
+    legacy_db = client[legacy_database]
+    collection = get_rank_collection(client)
+    prefix = LEGACY_COLLECTION_PREFIX.format(subnet=subnet)
+
+    inserted, skipped = 0, 0
+    for name in sorted(legacy_db.list_collection_names()):
+        if not name.startswith(prefix):
+            continue
+        uid = int(name[len(prefix):])
+        batch = []
+        for doc in legacy_db[name].find({}, {"_id": 0}).sort(TIME_FIELD, ASCENDING):
+            doc.setdefault("UID", uid)
+            if isinstance(doc[TIME_FIELD], str):
+                doc[TIME_FIELD] = datetime.fromisoformat(doc[TIME_FIELD])
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                batch_inserted, batch_skipped = save_rank_records(collection, subnet, batch)
+                inserted, skipped = inserted + batch_inserted, skipped + batch_skipped
+                batch = []
+        batch_inserted, batch_skipped = save_rank_records(collection, subnet, batch)
+        inserted, skipped = inserted + batch_inserted, skipped + batch_skipped
+    return inserted, skipped
@@ -0,0 +1,60 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from rank_store import TIME_FIELD, rank_frame_columns
+
+DEFAULT_WINDOW = timedelta(hours=6)
+
+# Process-wide rank frames, shared by every Streamlit session
+_frames = {}  # (backend, granularity, subnet, uids, window) -> DataFrame
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def _lock_for(key):
+    with _locks_lock:
+        return _locks.setdefault(key, threading.Lock())
+
+
+# Naive UTC timestamp, matching the datetimes pymongo returns
+def _naive_utc(moment):
+    return pd.Timestamp(moment).tz_convert("UTC").tz_localize(None)
+
+
+# Rank frame of the trailing window from a backend's raw records, or from one of
+# its rollups when granularity is given, refreshed incrementally: only records at
+# or after the last cached MAX_timestamp are read, and rows older than the window
+# are evicted. The last timestamp is re-read so late writes for it are picked up.
+def read_rank_window(backend, subnet, uids, window=DEFAULT_WINDOW, granularity=None):
+    key = (backend.name, granularity, subnet, tuple(uids), window)
+    since = _naive_utc(datetime.now(timezone.utc) - window)
+
+    def read_frame(start):
+        if granularity is None:
+            return backend.read_records(subnet, uids, start)
+        return backend.read_rollups(granularity, subnet, uids, start)
+
+    with _lock_for(key):
+        cached = _frames.get(key)
+        if cached is None or cached.empty:
+            frame = read_frame(since)
+        else:
+            last_seen = max(cached[TIME_FIELD].max(), since)
+            new_rows = read_frame(last_seen)
+            frame = pd.concat([cached[cached[TIME_FIELD] < last_seen], new_rows], ignore_index=True)
+
+        if not frame.empty:
+            frame = frame[frame[TIME_FIELD] >= since]
+            frame = frame[[column for column in rank_frame_columns(uids) if column in frame.columns]]
+            frame = frame.reset_index(drop=True)
+        _frames[key] = frame
+
+    # Callers scale columns in place, so never hand out the cached frame itself
+    return frame.copy()
+
+
+def clear():
+    with _locks_lock:
+        _frames.clear()
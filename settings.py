@@ -0,0 +1,13 @@
+import os
+
+import streamlit as st
+
+
+# Read a setting from the environment first, then from st.secrets
+def get_setting(name, default=None):
+    if name in os.environ:
+        return os.environ[name]
+    try:
+        return st.secrets[name]
+    except (KeyError, FileNotFoundError):
+        return default
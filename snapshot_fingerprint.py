@@ -0,0 +1,58 @@
+import hashlib
+import threading
+
+from rank_pipeline import SNAPSHOT_COLUMNS
+
+# Result of an ingest whose snapshot was already processed
+UNCHANGED = "unchanged"
+
+# Last processed (block_number, timestamp, digest, payload) of each subnet, kept
+# by the ingesting process
+_last = {}
+_lock = threading.Lock()
+
+
+# Highest block of a metagraph payload, its timestamp, and a digest of the fields
+# the rank records are computed from; costs one pass over the rows, no parsing
+# or ranking
+def fingerprint(data):
+    digest = hashlib.blake2b(digest_size=16)
+    block, timestamp = -1, None
+    for row in data:
+        values = tuple(row.get(column) for column in SNAPSHOT_COLUMNS)
+        digest.update(repr(values).encode())
+        row_block = int(row.get("block_number") or -1)
+        if row_block > block:
+            block, timestamp = row_block, row.get("timestamp")
+    return block, timestamp, digest.hexdigest()
+
+
+# Snapshot state to remember once data is processed, or None when data is the
+# payload last processed for the subnet (a cache hit or a 304 from the API
+# returns the same object) or is older than or identical to it
+def changed_snapshot(subnet, data):
+    with _lock:
+        last = _last.get(subnet)
+    if last is not None and data is last[3]:
+        return None
+    block, timestamp, digest = fingerprint(data)
+    if last is not None and (block < last[0] or (block == last[0] and digest == last[2])):
+        return None
+    return block, timestamp, digest, data
+
+
+def remember(subnet, snapshot):
+    with _lock:
+        _last[subnet] = snapshot
+
+
+# (block_number, timestamp) of the last snapshot processed for the subnet, or None
+def last_snapshot(subnet):
+    with _lock:
+        last = _last.get(subnet)
+    return last[:2] if last else None
+
+
+def clear():
+    with _lock:
+        _last.clear()
@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+PHASES = ["imports", "connections", "first render"]
+
+
+# Per-run timing of the app start-up: time spent importing modules, waiting on
+# network connections, and until the first section (the price header) is drawn
+class StartupTimer:
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self.durations = {phase: 0.0 for phase in PHASES}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    # Record the time from script start until now under name
+    def mark(self, name):
+        self.durations[name] = time.perf_counter() - self.started_at
+
+    def total(self):
+        return time.perf_counter() - self.started_at
+
+    def report(self):
+        report = dict(self.durations, total=self.total())
+        st.session_state["startup_timing"] = report
+        return report
+
+    def render(self):
+        report = self.report()
+        parts = " · ".join(f"{name} {seconds:.2f}s" for name, seconds in report.items() if name != "total")
+        st.caption(f"Rendered in {report['total']:.2f}s ({parts})")
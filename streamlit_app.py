@@ -1,10 +1,17 @@
+import time
+SCRIPT_START = time.perf_counter()
+
 import streamlit as st
+import api_cache
+import instrumentation
+from instrumentation import SECTION, measure
+from startup_timing import StartupTimer
+from prefetch import start_prefetch, wait_for_prefetch
 from Metrics.tao_price_metrics import display_tao_metrics
-from Metrics.tao_amounts_sn45 import display_account_sn45
-from Metrics.tao_amounts_sn30 import display_account_sn30
+from Metrics.tao_amounts_subnet import display_account_subnet
 from Metrics.tao_amounts_totals import display_account_total
-from sn45_rank_mongo import display_sn45_rank_mongo
-from sn30_rank_mongo import display_sn30_rank_mongo
+from Metrics.portfolio import build_portfolio_snapshot
+from subnet_registry import load_subnets
 
 # Set the title and favicon that appear in the Browser's tab bar.
 st.set_page_config(
@@ -12,25 +19,58 @@ st.set_page_config(
     page_icon=':pick:',
 )
 
+# Imports above stay light (no pandas, altair or pymongo); rank sections import theirs on first open
+timer = StartupTimer(SCRIPT_START)
+timer.add("imports", time.perf_counter() - SCRIPT_START)
+
+# Start a fresh hit/miss count for the taostats cache and a fresh operation record on every rerun
+api_cache.reset_render_stats()
+instrumentation.reset_render_stats()
+
 # Title
 st.title("TBD ⛏️")
 
+# Issue every taostats request up front and in parallel without blocking; sections below
+# join the in-flight requests or read from the cache
+prefetch = start_prefetch()
+
 # Section 2 - Metrics 1 (Tao Price Metrics)
 st.header("Tao Price Metrics", divider='gray')
-display_tao_metrics()
+with measure(SECTION, "display_tao_metrics"):
+    display_tao_metrics()
+timer.mark("first render")
 
-# Future sections can be added here following a similar modular approach
+with timer.phase("connections"):
+    wait_for_prefetch(prefetch)
 
-st.header("SN45 Metrics",divider='grey')
-display_account_sn45()
-st.subheader("Rank",divider='gray')
-display_sn45_rank_mongo()
+# One portfolio snapshot feeds the per-subnet and total sections
+with measure(SECTION, "build_portfolio_snapshot"):
+    portfolio = build_portfolio_snapshot()
 
-st.header("SN30 Metrics",divider='grey')
-display_account_sn30()
-st.subheader("Rank",divider='grey')
-display_sn30_rank_mongo()
+# Future sections can be added here following a similar modular approach
+
+# One account and rank section per subnet in the registry; the rank chart only loads
+# (and imports the Mongo/pandas/altair stack) once its expander is opened
+for netuid in load_subnets():
+    st.header(f"SN{netuid} Metrics",divider='grey')
+    with measure(SECTION, f"display_account_subnet sn{netuid}"):
+        display_account_subnet(netuid, portfolio)
+    rank_section = st.expander("Rank", key=f"rank_sn{netuid}", on_change="rerun")
+    if rank_section.open:
+        with rank_section:
+            with timer.phase("imports"):
+                from rank_mongo import display_rank_mongo
+            with measure(SECTION, f"display_rank_mongo sn{netuid}"):
+                display_rank_mongo(netuid)
 
 
 st.header("Total Metrics",divider='grey')
-display_account_total()
\ No newline at end of file
+with measure(SECTION, "display_account_total"):
+    display_account_total(portfolio)
+
+timer.render()
+
+# Optional per-rerun breakdown (?debug=1 or DEBUG_SIDEBAR) and the Prometheus export
+if instrumentation.debug_enabled():
+    instrumentation.render_debug_sidebar(api_cache.render_stats())
+instrumentation.export_metrics()
@@ -0,0 +1,39 @@
+import os
+import tomllib
+from functools import lru_cache
+
+from settings import get_setting
+
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "subnets.toml")
+
+SUBNET_DEFAULTS = {
+    "api_key": "API_TAO",
+    "uids": [],
+    "reward_uids": None,
+    "wallets": [],
+    "legacy_database": None,
+    "tempo": 360,
+}
+
+
+# Load the subnet registry: {netuid: config}, in file order
+@lru_cache(maxsize=None)
+def load_subnets(path=None):
+    path = path or get_setting("SUBNETS_CONFIG", DEFAULT_REGISTRY_PATH)
+    with open(path, "rb") as f:
+        entries = tomllib.load(f).get("subnet", [])
+
+    subnets = {}
+    for entry in entries:
+        config = {**SUBNET_DEFAULTS, **entry}
+        config["netuid"] = int(config["netuid"])
+        if config["reward_uids"] is None:
+            config["reward_uids"] = config["uids"]
+        if config["netuid"] in subnets:
+            raise ValueError(f"Subnet {config['netuid']} is listed twice in {path}")
+        subnets[config["netuid"]] = config
+    return subnets
+
+
+def get_subnet(netuid):
+    return load_subnets()[netuid]
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+import streamlit.logger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_cache
+import api_client
+import rank_backend
+import rank_window
+import snapshot_fingerprint
+import subnet_registry
+import trend_signals
+from fake_taostats import FakeTaostats, SyntheticChain, start_server
+
+# The rank modules run outside a Streamlit session here
+streamlit.logger.set_log_level("error")
+
+NETUID = 45
+UIDS = [0, 7, 21, 42, 63]
+
+# Block the synthetic chain is frozen at; a multiple of the history interval, so
+# the history has a snapshot at exactly this block
+FROZEN_BLOCK = 4_100_000
+
+
+# Process-wide caches and ingestion state start empty in every test
+@pytest.fixture(autouse=True)
+def clean_state():
+    yield
+    api_cache.clear()
+    api_client._conditional.clear()
+    rank_window.clear()
+    snapshot_fingerprint.clear()
+    trend_signals.clear()
+    rank_backend.set_backend(None)
+
+
+# Registry holding one subnet with the test UIDs
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    path = tmp_path / "subnets.toml"
+    path.write_text(f'[[subnet]]\nnetuid = {NETUID}\napi_key = "API_TAO"\nuids = {UIDS}\n')
+    monkeypatch.setenv("SUBNETS_CONFIG", str(path))
+    subnet_registry.load_subnets.cache_clear()
+    yield subnet_registry.load_subnets()
+    subnet_registry.load_subnets.cache_clear()
+
+
+# Local taostats stand-in serving a synthetic chain frozen at FROZEN_BLOCK
+@pytest.fixture
+def fake_api(monkeypatch):
+    chain = SyntheticChain(neurons=64, speed=0)
+    chain.started = chain.block_time(FROZEN_BLOCK).timestamp()
+    app = FakeTaostats(chain)
+    server = start_server(app)
+    monkeypatch.setattr(api_client, "API_BASE_URL", server.base_url)
+    # No real quota to protect
+    monkeypatch.setattr(api_client, "DEFAULT_RATE_LIMIT", 60_000.0)
+    monkeypatch.setattr(api_client, "KEY_RATE_LIMITS", {})
+    monkeypatch.setattr(api_client, "_limiters", {})
+    yield app
+    server.shutdown()
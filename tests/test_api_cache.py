@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import api_cache
+from tests.conftest import NETUID
+
+PATH = "metagraph/latest/v1"
+PARAMS = {"netuid": NETUID, "order": "emission_desc"}
+CALLERS = 8
+
+
+# Runs get_json from CALLERS threads released together; returns each outcome
+def concurrent_calls(**kwargs):
+    barrier = threading.Barrier(CALLERS)
+
+    def call():
+        barrier.wait()
+        try:
+            return api_cache.get_json(PATH, PARAMS, **kwargs)
+        except requests.exceptions.RequestException as e:
+            return e
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        return list(pool.map(lambda _: call(), range(CALLERS)))
+
+
+# Concurrent callers share one upstream request and its value
+def test_concurrent_callers_make_one_request(fake_api):
+    fake_api.latency_ms = 300
+    results = concurrent_calls()
+    assert fake_api.requests == 1
+    assert all(result is results[0] for result in results)
+    assert api_cache.get_json(PATH, PARAMS) is results[0]
+    assert fake_api.requests == 1
+
+
+# The owner's error reaches every waiting caller, and nothing is cached
+def test_error_is_passed_to_waiting_callers(fake_api):
+    fake_api.latency_ms = 300
+    fake_api.error_rate = 1.0
+    fake_api.error_statuses = [404]
+    results = concurrent_calls()
+    assert fake_api.requests == 1
+    assert all(isinstance(result, requests.exceptions.HTTPError) for result in results)
+
+    fake_api.error_rate = 0.0
+    assert api_cache.get_json(PATH, PARAMS)
+    assert fake_api.requests == 2
+
+
+class FakeClock:
+    now = 1000.0
+
+    @classmethod
+    def monotonic(cls):
+        return cls.now
+
+
+@pytest.fixture(autouse=True)
+def reset_clock():
+    FakeClock.now = 1000.0
+
+
+# A value is served from the cache until its TTL has passed
+def test_entry_expires_after_ttl(fake_api, monkeypatch):
+    monkeypatch.setattr(api_cache, "time", FakeClock)
+    api_cache.get_json(PATH, PARAMS, ttl=60)
+    FakeClock.now += 59
+    api_cache.get_json(PATH, PARAMS, ttl=60)
+    assert fake_api.requests == 1
+    FakeClock.now += 2
+    api_cache.get_json(PATH, PARAMS, ttl=60)
+    assert fake_api.requests == 2
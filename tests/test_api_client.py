@@ -0,0 +1,49 @@
+import json
+
+import requests
+
+import api_client
+from tests.conftest import NETUID
+
+PATH = "metagraph/latest/v1"
+PARAMS = {"netuid": NETUID, "order": "emission_desc"}
+
+
+# A 304 on revalidation returns the earlier parsed body itself
+def test_conditional_request_reuses_body(fake_api):
+    first = api_client.get_json(PATH, PARAMS, key="API_TAO")
+    second = api_client.get_json(PATH, PARAMS, key="API_TAO")
+    assert second is first
+    assert fake_api.requests == 2
+
+
+# Each API key keeps its own validators and bodies
+def test_conditional_cache_is_per_key(fake_api):
+    first = api_client.get_json(PATH, PARAMS, key="API_TAO")
+    other = api_client.get_json(PATH, PARAMS, key="API_TAO_30")
+    assert other is not first
+    assert other == first
+
+
+def _response(status, body=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode() if body is not None else b""
+    response.url = f"{api_client.API_BASE_URL}/{PATH}"
+    return response
+
+
+# A 304 with no stored body is retried without conditional headers
+def test_not_modified_without_stored_body(monkeypatch):
+    sent = []
+    responses = [_response(304), _response(200, {"data": []})]
+
+    def get(url, headers=None, params=None, timeout=None):
+        sent.append(dict(headers))
+        return responses.pop(0)
+
+    monkeypatch.setattr(api_client.get_session(), "get", get)
+    monkeypatch.setattr(api_client, "_limiters", {})
+    assert api_client.get_json(PATH, PARAMS, key="API_TAO") == {"data": []}
+    assert len(sent) == 2
+    assert "If-None-Match" not in sent[1] and "If-Modified-Since" not in sent[1]
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import time
+
+import ingest
+from ingest import FileIngestLock
+from poll_schedule import ERROR_BACKOFF_SECONDS, SubnetSchedule
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "rank_ingest.lock")
+    first, second = FileIngestLock(path), FileIngestLock(path)
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.acquire()
+    first.release()
+    assert second.acquire()
+    assert not first.acquire()
+    second.release()
+
+
+# A process that dies while holding the lock leaves it free
+def test_file_lock_is_freed_when_the_holder_exits(tmp_path):
+    path = str(tmp_path / "rank_ingest.lock")
+    holder = subprocess.Popen(
+        [sys.executable, "-c", f"import ingest, sys; lock = ingest.FileIngestLock({path!r}); "
+                               "print(lock.acquire(), flush=True); sys.stdin.read()"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=REPO_ROOT,
+    )
+    assert holder.stdout.readline().strip() == "True"
+    lock = FileIngestLock(path)
+    assert not lock.acquire()
+    holder.kill()
+    holder.wait()
+    assert lock.acquire()
+    lock.release()
+
+
+# A storage error delays the subnet's next poll instead of stopping ingestion
+def test_storage_error_backs_off(monkeypatch):
+    def failing_ingest(subnet):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(ingest, "ingest_subnet", failing_ingest)
+    schedule = SubnetSchedule(45, 360, 1080, now=0.0)
+    before = time.time()
+    ingest.poll_scheduled(45, schedule)
+    assert schedule.failures == 1
+    assert schedule.next_poll >= before + ERROR_BACKOFF_SECONDS
@@ -0,0 +1,135 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import trend_signals
+from poll_schedule import (
+    BLOCK_SECONDS,
+    CATCH_UP_SECONDS,
+    EPOCH_SETTLE_SECONDS,
+    ERROR_BACKOFF_CAP,
+    ERROR_BACKOFF_SECONDS,
+    FAST_INTERVAL,
+    JITTER_SECONDS,
+    SubnetSchedule,
+    blocks_until_epoch,
+    near_deregistration,
+)
+
+NETUID, TEMPO = 45, 360
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc).timestamp()
+SEED = 7
+# Subtensor runs the epoch of NETUID at this block
+EPOCH_BLOCK = 4_100_000 - (4_100_000 + NETUID + 2) % (TEMPO + 1)
+
+
+def schedule():
+    return SubnetSchedule(NETUID, TEMPO, 1080, now=NOW, rng=random.Random(SEED))
+
+
+# Jitter values the schedule draws, in order: the first one staggers its first poll
+def jitters():
+    rng = random.Random(SEED)
+    while True:
+        yield rng.uniform(0, JITTER_SECONDS)
+
+
+def iso(unix):
+    return datetime.fromtimestamp(unix, timezone.utc).isoformat()
+
+
+def test_blocks_until_epoch():
+    assert blocks_until_epoch(NETUID, TEMPO, EPOCH_BLOCK - 1) == 1
+    assert blocks_until_epoch(NETUID, TEMPO, EPOCH_BLOCK) == TEMPO + 1
+    assert blocks_until_epoch(NETUID, TEMPO, EPOCH_BLOCK - 100) == 100
+
+
+def test_first_polls_are_jittered():
+    jitter = jitters()
+    assert schedule().next_poll == NOW + next(jitter)
+    polls = [SubnetSchedule(NETUID, TEMPO, 1080, now=NOW, rng=random.Random(seed)).next_poll for seed in range(50)]
+    assert all(NOW <= poll <= NOW + JITTER_SECONDS for poll in polls)
+    assert len(set(polls)) == len(polls)
+
+
+# The next poll lands EPOCH_SETTLE_SECONDS after the boundary, counted from the
+# snapshot's chain time rather than when it was seen
+def test_poll_is_aligned_to_the_next_epoch():
+    jitter, subnet = jitters(), schedule()
+    next(jitter)
+    block_time = NOW - 30
+    subnet.polled(NOW, (EPOCH_BLOCK - 100, iso(block_time)), changed=True)
+    assert subnet.next_poll == block_time + 100 * BLOCK_SECONDS + EPOCH_SETTLE_SECONDS + next(jitter)
+
+    # Without a snapshot the fallback interval applies
+    fallback = schedule()
+    fallback.polled(NOW, None, changed=False)
+    assert NOW + 1080 <= fallback.next_poll <= NOW + 1080 + JITTER_SECONDS
+
+
+# While taostats still serves the old epoch the retry delay doubles, up to one
+# epoch; a new snapshot resets it
+def test_stale_snapshot_retries_double():
+    jitter, subnet = jitters(), schedule()
+    next(jitter)
+    snapshot = (EPOCH_BLOCK - 1, iso(NOW))
+    subnet.polled(NOW, snapshot, changed=True)
+    due = NOW + BLOCK_SECONDS + EPOCH_SETTLE_SECONDS
+    assert subnet.next_poll == due + next(jitter)
+
+    now = due
+    for attempt in range(8):
+        subnet.polled(now, snapshot, changed=False)
+        delay = min(CATCH_UP_SECONDS * 2 ** attempt, (TEMPO + 1) * BLOCK_SECONDS)
+        assert subnet.next_poll == now + delay + next(jitter)
+        now = subnet.next_poll
+    assert delay == (TEMPO + 1) * BLOCK_SECONDS
+
+    subnet.polled(now, (EPOCH_BLOCK, iso(now)), changed=True)
+    assert subnet.stale == 0
+    assert subnet.next_poll == now + (TEMPO + 1) * BLOCK_SECONDS + EPOCH_SETTLE_SECONDS + next(jitter)
+
+
+def test_urgent_subnet_is_polled_faster():
+    jitter, subnet = jitters(), schedule()
+    next(jitter)
+    subnet.polled(NOW, (EPOCH_BLOCK - 300, iso(NOW)), changed=True, urgent=True)
+    assert subnet.next_poll == NOW + FAST_INTERVAL + next(jitter)
+    # An epoch due sooner than the fast interval is kept
+    subnet.polled(NOW, (EPOCH_BLOCK - 1, iso(NOW)), changed=True, urgent=True)
+    assert subnet.next_poll == NOW + BLOCK_SECONDS + EPOCH_SETTLE_SECONDS + next(jitter)
+
+
+def test_failures_back_off():
+    jitter, subnet = jitters(), schedule()
+    next(jitter)
+    for failure in range(7):
+        subnet.failed(NOW)
+        delay = min(ERROR_BACKOFF_CAP, ERROR_BACKOFF_SECONDS * 2 ** failure)
+        assert subnet.next_poll == NOW + delay + next(jitter)
+    assert delay == ERROR_BACKOFF_CAP
+    subnet.failed(NOW, retry_after=3600)
+    assert subnet.next_poll == NOW + 3600 + next(jitter)
+    subnet.polled(NOW, None, changed=False)
+    assert subnet.failures == 0
+
+
+def state(uid, reward=5.0, hours=None, risk=10, immune=False):
+    return {
+        "UID": uid,
+        "MAX_timestamp": datetime.now(timezone.utc) - timedelta(minutes=5),
+        "DAILY_REWARD": reward,
+        "IS_IMMUNE": immune,
+        "HOURS_TO_DEREGISTER_threshold": hours,
+        "COUNT_NON_IMMUNE_daily_reward_less_UID": risk,
+    }
+
+
+def test_near_deregistration():
+    trend_signals.save_trends({(NETUID, 1): state(1, hours=40.0)})
+    assert not near_deregistration(NETUID)
+    trend_signals.save_trends({(NETUID, 2): state(2, hours=3.0)})
+    assert near_deregistration(NETUID)
+    trend_signals.save_trends({(NETUID, 2): state(2, hours=3.0, immune=True), (NETUID, 3): state(3, risk=2)})
+    assert near_deregistration(NETUID)
+    trend_signals.save_trends({(NETUID, 3): state(3, reward=0.0, risk=0)})
+    assert not near_deregistration(NETUID)
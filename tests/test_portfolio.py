@@ -0,0 +1,30 @@
+import subnet_registry
+from Metrics.portfolio import build_portfolio_snapshot
+
+SHARED = "5GseRuwpzHoimJW5CYwg2BQDtoxHD3tSKSkPEwM7fxoYrVvF"
+OTHER = "5HES48QipR5xVQyhFDSFPCzWmtvjnE4R4Tvb4S4rBqqS6yvD"
+
+
+# A wallet listed under two subnets counts once in the total balances, while
+# the daily rewards of both subnets add up
+def test_shared_wallet_counted_once(tmp_path, monkeypatch, fake_api):
+    path = tmp_path / "subnets.toml"
+    path.write_text(
+        f'[[subnet]]\nnetuid = 45\nuids = [1]\nwallets = ["{SHARED}"]\n\n'
+        f'[[subnet]]\nnetuid = 30\nuids = [2]\nwallets = ["{SHARED}", "{OTHER}"]\n'
+    )
+    monkeypatch.setenv("SUBNETS_CONFIG", str(path))
+    subnet_registry.load_subnets.cache_clear()
+    try:
+        snapshot = build_portfolio_snapshot()
+    finally:
+        subnet_registry.load_subnets.cache_clear()
+
+    chain = fake_api.chain
+    balances = {address: chain.account(address)[0] for address in (SHARED, OTHER)}
+    expected_total = sum(int(balance["balance_total"]) for balance in balances.values())
+    assert snapshot["total"]["total_balance"] == expected_total
+    assert snapshot["total"]["free_balance"] == sum(int(balance["balance_free"]) for balance in balances.values())
+    assert snapshot["subnets"][30]["total_balance"] == expected_total
+    assert snapshot["total"]["daily_reward"] == sum(metrics["daily_reward"] for metrics in snapshot["subnets"].values())
+    assert snapshot["total"]["daily_reward"] > 0
@@ -0,0 +1,82 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from fake_taostats import SyntheticChain
+from rank_backend import MongoRankBackend, ParquetRankBackend, RankBackend
+from rank_pipeline import compute_rank_records
+from rank_rollups import ROLLUPS, get_rollup_collection
+from rank_store import get_rank_collection
+
+# Subnet written to MongoDB by the parity test, away from the tracked ones;
+# its records are deleted afterwards
+PARITY_SUBNET = 9901
+UIDS = [0, 3, 17, 40, 63]
+
+
+def test_incomplete_backend_fails_when_created():
+    class ReadOnlyBackend(RankBackend):
+        def read_records(self, subnet, uids, since, until=None):
+            return pd.DataFrame()
+
+    with pytest.raises(TypeError):
+        ReadOnlyBackend()
+
+
+# A day of 18-minute snapshots ending now, with sub-millisecond timestamps
+def snapshot_records(snapshots=40):
+    chain = SyntheticChain(neurons=64)
+    now = datetime.now(timezone.utc).replace(microsecond=123456)
+    records = []
+    for step in range(snapshots):
+        data = chain.metagraph(PARITY_SUBNET, 4_100_000 - step * 90)
+        timestamp = (now - timedelta(minutes=18 * step)).isoformat()
+        records += compute_rank_records([dict(row, timestamp=timestamp) for row in data], UIDS)
+    return now, records
+
+
+# Reads the MongoDB server at TEST_MONGO_URI (a scratch server: the test writes
+# to rank_database under its own subnet)
+@pytest.fixture
+def mongo_backend():
+    uri = os.environ.get("TEST_MONGO_URI")
+    if not uri:
+        pytest.skip("TEST_MONGO_URI is not set")
+    from pymongo import MongoClient
+
+    client = MongoClient(uri)
+    backend = MongoRankBackend(client)
+    yield backend
+    get_rank_collection(client).delete_many({"meta.subnet": PARITY_SUBNET})
+    for granularity in ROLLUPS:
+        get_rollup_collection(client, granularity).delete_many({"meta.subnet": PARITY_SUBNET})
+    client.close()
+
+
+def test_mongo_and_parquet_backends_agree(tmp_path, mongo_backend):
+    parquet_backend = ParquetRankBackend(str(tmp_path))
+    now, records = snapshot_records()
+    for backend in (mongo_backend, parquet_backend):
+        assert backend.write_records(PARITY_SUBNET, records) == (len(records), 0)
+        assert backend.write_records(PARITY_SUBNET, records[:30]) == (0, 30)
+
+    since = (now - timedelta(hours=6)).replace(tzinfo=None)
+    parquet_frame = parquet_backend.read_records(PARITY_SUBNET, UIDS, since)
+    mongo_frame = mongo_backend.read_records(PARITY_SUBNET, UIDS, since)
+    assert not parquet_frame.empty
+    assert list(parquet_frame.columns) == list(mongo_frame.columns)
+    pd.testing.assert_frame_equal(
+        parquet_frame.reset_index(drop=True),
+        mongo_frame.reset_index(drop=True).astype(parquet_frame.dtypes.to_dict()),
+        check_dtype=False,
+    )
+
+    parquet_latest = parquet_backend.read_latest(PARITY_SUBNET, UIDS, since)
+    mongo_latest = mongo_backend.read_latest(PARITY_SUBNET, UIDS, since)
+    assert parquet_latest.keys() == mongo_latest.keys() == set(UIDS)
+    for uid in UIDS:
+        assert parquet_latest[uid]["MAX_block_number"] == mongo_latest[uid]["MAX_block_number"]
+        assert parquet_latest[uid]["COUNT_NON_IMMUNE_daily_reward_less_UID"] == \
+            mongo_latest[uid]["COUNT_NON_IMMUNE_daily_reward_less_UID"]
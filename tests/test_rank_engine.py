@@ -0,0 +1,71 @@
+import math
+import random
+
+import numpy as np
+import pandas as pd
+
+from rank_engine import SnapshotRanks
+from rank_pipeline import compute_rank_records, parse_snapshot
+
+
+# Counts as computed before the rank engine: boolean masks over the whole group,
+# one per UID
+def mask_counts(group, reward):
+    if pd.isna(reward):
+        return 0, 0
+    greater = len(group[(group["daily_reward"] > reward) & ~group["is_validator"]])
+    less = len(group[(group["daily_reward"] < reward) & ~group["is_immunity_period"]])
+    return greater, less
+
+
+def random_snapshot(rng, neurons, block=4_100_000):
+    return [
+        {
+            "uid": uid,
+            "block_number": block,
+            "timestamp": "2026-03-01T00:00:00Z",
+            "daily_reward": rng.choice([None, 0, 5, 5, 7]) if rng.random() < 0.2 else str(rng.randrange(0, 1000)),
+            "is_immunity_period": rng.random() < 0.1,
+            "validator_trust": "0" if rng.random() < 0.9 else "0.5",
+        }
+        for uid in range(neurons)
+    ]
+
+
+def test_searchsorted_counts_match_masks():
+    rng = random.Random(0)
+    for _ in range(20):
+        group = parse_snapshot(random_snapshot(rng, rng.randrange(1, 300)))
+        rewards = group["daily_reward"].to_numpy()
+        ranks = SnapshotRanks(rewards, group["is_validator"].to_numpy(), group["is_immunity_period"].to_numpy())
+        greater = ranks.miner_rank(rewards)
+        less = ranks.deregister_risk(rewards)
+        for index, reward in enumerate(rewards):
+            assert (greater[index], less[index]) == mask_counts(group, reward)
+
+
+def test_percentile():
+    ranks = SnapshotRanks(
+        rewards=[10.0, 20.0, 30.0, 40.0, math.nan],
+        is_validator=[False, False, False, True, False],
+        is_immune=[True, False, False, False, False],
+    )
+    np.testing.assert_allclose(ranks.percentile([10.0, 25.0, 30.0]), [100 / 3, 200 / 3, 100.0])
+    assert math.isnan(ranks.percentile([math.nan])[0])
+
+
+# Each record's percentile is its UID's standing among the miners of its own block
+def test_records_carry_percentile():
+    rng = random.Random(1)
+    data = random_snapshot(rng, 200) + random_snapshot(rng, 200, block=4_100_025)
+    df = parse_snapshot(data)
+    records = compute_rank_records(data, [3, 150])
+    assert len(records) == 4
+    for record in records:
+        group = df[df["block_number"] == record["MAX_block_number"]]
+        miners = group.loc[~group["is_validator"], "daily_reward"].dropna()
+        reward = record["DAILY_REWARD"]
+        if pd.isna(reward):
+            assert record["PERCENTILE_NON_VALI_daily_reward"] is None
+        else:
+            assert record["PERCENTILE_NON_VALI_daily_reward"] == 100 * (miners <= reward).sum() / len(miners)
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+
+import rank_retention
+from rank_retention import first_complete_day
+
+NOW = datetime(2026, 3, 10, 14, 30, tzinfo=timezone.utc)
+
+
+def test_first_complete_day(monkeypatch):
+    monkeypatch.setenv("RANK_RETENTION_DAYS", "7")
+    # Records before 2026-03-03 14:30 have expired, so 03-03 is partial
+    assert first_complete_day(NOW) == datetime(2026, 3, 4)
+    # 03-04 starts within the expiry margin
+    assert first_complete_day(NOW.replace(hour=23, minute=30)) == datetime(2026, 3, 5)
+    monkeypatch.setenv("RANK_RETENTION_DAYS", "0")
+    assert first_complete_day(NOW) is None
+
+
+class OldestRecord:
+    def __init__(self, moment):
+        self.moment = moment
+
+    def find_one(self, *args, **kwargs):
+        return {rank_retention.TIME_FIELD: self.moment}
+
+
+# Days that may have partly expired are neither rolled up nor archived
+def test_archive_starts_at_the_first_complete_day(tmp_path, monkeypatch):
+    monkeypatch.setenv("RANK_RETENTION_DAYS", "7")
+    today = datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+    oldest = today - timedelta(days=20)
+    rollups, exports = [], []
+    monkeypatch.setattr(rank_retention, "get_rank_collection", lambda client: OldestRecord(oldest))
+    monkeypatch.setattr(rank_retention, "update_rollups", lambda client, subnet, since, until: rollups.append((since, until)))
+    monkeypatch.setattr(rank_retention, "export_day", lambda collection, subnet, day, path: exports.append(day) or 1)
+
+    rank_retention.archive_subnet(None, 45, root=str(tmp_path))
+    first = first_complete_day()
+    assert exports == [first + timedelta(days=day) for day in range((today - first).days)]
+    assert rollups == [(first, today - timedelta(milliseconds=1))]
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from rank_rollups import ROLLUPS, TIME_FIELD, bucket_end, rollup_pipeline
+
+
+# Writing a backfill chunk recomputes only the buckets the chunk covers, not
+# every bucket up to now
+def test_rollup_pipeline_is_bounded_by_the_written_records():
+    since, until = datetime(2026, 3, 1, 10, 7, 30), datetime(2026, 3, 1, 11, 2)
+    expected = {
+        "5m": (datetime(2026, 3, 1, 10, 5), datetime(2026, 3, 1, 11, 5)),
+        "1h": (datetime(2026, 3, 1, 10), datetime(2026, 3, 1, 12)),
+        "1d": (datetime(2026, 3, 1), datetime(2026, 3, 2)),
+    }
+    for granularity in ROLLUPS:
+        time_range = rollup_pipeline(45, granularity, since, until)[0]["$match"][TIME_FIELD]
+        assert (time_range["$gte"], time_range["$lt"]) == expected[granularity]
+        assert "$lt" not in rollup_pipeline(45, granularity, since)[0]["$match"][TIME_FIELD]
+
+
+# A record exactly on a bucket boundary falls into the bucket it starts
+def test_bucket_end_on_boundary():
+    assert bucket_end(datetime(2026, 3, 1, 10, 5), "5m") == datetime(2026, 3, 1, 10, 10)
+    assert bucket_end(datetime(2026, 3, 1), "1d") == datetime(2026, 3, 2)
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import rank_window
+from fake_taostats import SyntheticChain
+from rank_backend import ParquetRankBackend
+from rank_pipeline import compute_rank_records
+from rank_window import read_rank_window
+from tests.conftest import FROZEN_BLOCK, NETUID, UIDS
+
+START = datetime.now(timezone.utc).replace(microsecond=0)
+SNAPSHOT_MINUTES = 18
+
+
+# Records of the snapshots at the given minutes before START
+def snapshot_records(chain, minutes_ago, uids=UIDS):
+    records = []
+    for minutes in minutes_ago:
+        data = chain.metagraph(NETUID, FROZEN_BLOCK - minutes * 5)
+        timestamp = (START - timedelta(minutes=minutes)).isoformat()
+        records += compute_rank_records([dict(row, timestamp=timestamp) for row in data], uids)
+    return records
+
+
+# Clock of rank_window moved forward by offset
+def advance_clock(monkeypatch, offset):
+    class ShiftedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + offset
+
+    monkeypatch.setattr(rank_window, "datetime", ShiftedDatetime)
+
+
+# The incrementally refreshed frame matches a fresh read after each step: new
+# snapshots, a late write at the last cached timestamp, and eviction once rows
+# fall out of the window
+@pytest.mark.parametrize("window, granularity", [(timedelta(hours=6), None), (timedelta(hours=24), "5m")])
+def test_warm_window_matches_cold_read(tmp_path, monkeypatch, window, granularity):
+    chain = SyntheticChain(neurons=64)
+    backend = ParquetRankBackend(str(tmp_path))
+    reads = 0
+
+    def check():
+        nonlocal reads
+        warm = read_rank_window(backend, NETUID, UIDS, window, granularity)
+        reads += 1
+        cold_backend = ParquetRankBackend(str(tmp_path))
+        cold_backend.name = f"cold-{reads}"
+        cold = read_rank_window(cold_backend, NETUID, UIDS, window, granularity)
+        assert not warm.empty
+        # Rank columns turn float wherever a UID has gaps, so only values are compared
+        pd.testing.assert_frame_equal(warm, cold, check_dtype=False)
+        return warm
+
+    span = int(window.total_seconds() // 60)
+    # Older than the window, inside it, and the newest snapshot without its last UID
+    backend.write_records(NETUID, snapshot_records(chain, range(span + 120, 60, -SNAPSHOT_MINUTES)))
+    backend.write_records(NETUID, snapshot_records(chain, [60], UIDS[:-1]))
+    first = check()
+    assert first[f"UID {UIDS[-1]}"].isna().iloc[-1]
+
+    # The late record for the last cached timestamp, then newer snapshots
+    backend.write_records(NETUID, snapshot_records(chain, [60], UIDS[-1:]))
+    backend.write_records(NETUID, snapshot_records(chain, range(60 - SNAPSHOT_MINUTES, -1, -SNAPSHOT_MINUTES)))
+    second = check()
+    assert second[f"UID {UIDS[-1]}"].notna().all()
+    assert len(second) > len(first)
+
+    # Two hours later the oldest rows have left the window
+    advance_clock(monkeypatch, timedelta(hours=2))
+    third = check()
+    assert third["MAX_timestamp"].min() > second["MAX_timestamp"].min()
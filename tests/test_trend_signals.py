@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import rank_backend
+import trend_signals
+from rank_backend import ParquetRankBackend
+from rank_mongo import process_and_save_data
+from tests.conftest import FROZEN_BLOCK, NETUID, UIDS
+
+
+def record(uid, moment, reward, risk=10, threshold=1.0):
+    return {
+        "UID": uid,
+        "MAX_block_number": int(moment.timestamp()) // 12,
+        "MAX_timestamp": moment,
+        "DAILY_REWARD": reward,
+        "IS_IMMUNE": False,
+        "MIN_daily_reward": threshold,
+        "MIN_NON_IMMUNE_daily_reward": threshold,
+        "MAX_NON_VALI_daily_reward": 100.0,
+        "COUNT_NON_VALI_daily_reward_greater_UID": 5,
+        "COUNT_NON_IMMUNE_daily_reward_less_UID": risk,
+    }
+
+
+# A UID that joins after the first records of its subnet still continues its
+# stored trend instead of restarting
+def test_late_uid_is_seeded_from_storage(tmp_path):
+    backend = ParquetRankBackend(str(tmp_path))
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=2)
+
+    stored = [record(1, start, 10.0), record(2, start, 20.0, risk=4)]
+    trend_signals.apply_trends(backend, 45, stored)
+    backend.write_records(45, stored)
+    trend_signals.clear()
+
+    # A restarted process first sees only UID 1, then UID 2 as well
+    trend_signals.apply_trends(backend, 45, [record(1, start + timedelta(hours=1), 12.0)])
+    later = record(2, start + timedelta(hours=1), 30.0, risk=8)
+    trend_signals.apply_trends(backend, 45, [later])
+
+    assert later["SLOPE_Deregister_Risk_per_hour"] != 0.0
+    assert 20.0 < later["EWMA_daily_reward"] < 30.0
+
+
+# A snapshot whose write failed is stored with its trend fields when retried
+def test_failed_write_keeps_trend_state(tmp_path, monkeypatch, registry, fake_api):
+    backend = ParquetRankBackend(str(tmp_path))
+    rank_backend.set_backend(backend)
+    chain = fake_api.chain
+    assert process_and_save_data(NETUID, chain.metagraph(NETUID, FROZEN_BLOCK - 360))[0] == len(UIDS)
+
+    write_records = backend.write_records
+
+    def failing_write(subnet, records):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(backend, "write_records", failing_write)
+    with pytest.raises(OSError):
+        process_and_save_data(NETUID, chain.metagraph(NETUID, FROZEN_BLOCK))
+    monkeypatch.setattr(backend, "write_records", write_records)
+    assert process_and_save_data(NETUID, chain.metagraph(NETUID, FROZEN_BLOCK))[0] == len(UIDS)
+
+    latest = backend.read_latest(NETUID, UIDS, datetime(2000, 1, 1))
+    assert set(latest) == set(UIDS)
+    for record in latest.values():
+        assert record["MAX_block_number"] == FROZEN_BLOCK
+        assert record["EWMA_daily_reward"] is not None
+        assert record["SLOPE_Deregister_Risk_per_hour"] is not None
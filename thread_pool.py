@@ -0,0 +1,16 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+
+# Thread pool whose workers share the current script run context, so st.* calls
+# and per-render stats from worker threads attach to the page being rendered
+def script_thread_pool(max_workers):
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def attach_ctx():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    return ThreadPoolExecutor(max_workers=max(max_workers, 1), initializer=attach_ctx)
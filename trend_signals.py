@@ -0,0 +1,141 @@
+import math
+import threading
+from datetime import timedelta
+
+import pandas as pd
+
+from settings import get_setting
+
+# Trend fields stored on each rank record, next to the per-poll values
+TREND_FIELDS = [
+    "EWMA_daily_reward",
+    "SLOPE_Deregister_Risk_per_hour",
+    "MARGIN_NON_IMMUNE_daily_reward",
+    "SLOPE_MARGIN_NON_IMMUNE_per_hour",
+    "HOURS_TO_DEREGISTER_threshold",
+]
+
+# Half-life of the exponential averages, in hours of MAX_timestamp
+TREND_HALF_LIFE_HOURS = float(get_setting("TREND_HALF_LIFE_HOURS", 3))
+
+# How far back the ingestion process looks for each UID's last record when it
+# starts; older trends restart from the next record
+STATE_LOOKBACK = timedelta(days=1)
+
+# Last record with trend fields of each (subnet, uid), kept by the ingestion process
+_states = {}
+_loaded = set()  # (subnet, uid) pairs already seeded from storage
+_lock = threading.Lock()
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _utc(timestamp):
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+
+# Time-aware exponential average: the weight of the new value grows with the
+# hours since the previous one, so irregular polling does not skew the average
+def _ewma(previous, value, alpha):
+    if _missing(previous):
+        return value
+    if _missing(value):
+        return previous
+    return previous + alpha * (value - previous)
+
+
+# Trend fields of record given the previous record of the same UID (or None);
+# constant time per record
+def trend_signals(previous, record, half_life_hours=TREND_HALF_LIFE_HOURS):
+    reward = record["DAILY_REWARD"]
+    risk = record["COUNT_NON_IMMUNE_daily_reward_less_UID"]
+    threshold = record["MIN_NON_IMMUNE_daily_reward"]
+    margin = None if _missing(reward) or _missing(threshold) else reward - threshold
+
+    hours = 0.0
+    if previous is not None:
+        hours = (_utc(record["MAX_timestamp"]) - _utc(previous["MAX_timestamp"])).total_seconds() / 3600
+    if previous is None or hours <= 0 or any(_missing(previous.get(field)) for field in TREND_FIELDS[:2]):
+        return {
+            "EWMA_daily_reward": reward,
+            "SLOPE_Deregister_Risk_per_hour": 0.0,
+            "MARGIN_NON_IMMUNE_daily_reward": margin,
+            "SLOPE_MARGIN_NON_IMMUNE_per_hour": 0.0 if margin is not None else None,
+            "HOURS_TO_DEREGISTER_threshold": 0.0 if margin is not None and margin <= 0 else None,
+        }
+
+    alpha = 1 - 0.5 ** (hours / half_life_hours)
+    risk_slope = _ewma(
+        previous["SLOPE_Deregister_Risk_per_hour"],
+        (risk - previous["COUNT_NON_IMMUNE_daily_reward_less_UID"]) / hours,
+        alpha,
+    )
+    previous_margin = previous.get("MARGIN_NON_IMMUNE_daily_reward")
+    margin_slope = previous.get("SLOPE_MARGIN_NON_IMMUNE_per_hour")
+    if margin is not None and not _missing(previous_margin):
+        margin_slope = _ewma(margin_slope, (margin - previous_margin) / hours, alpha)
+    elif margin is not None:
+        margin_slope = 0.0
+
+    # Hours until the margin reaches zero at the current downward slope
+    hours_to_threshold = None
+    if margin is not None and margin <= 0:
+        hours_to_threshold = 0.0
+    elif margin is not None and not _missing(margin_slope) and margin_slope < 0:
+        hours_to_threshold = margin / -margin_slope
+
+    return {
+        "EWMA_daily_reward": _ewma(previous["EWMA_daily_reward"], reward, alpha),
+        "SLOPE_Deregister_Risk_per_hour": risk_slope,
+        "MARGIN_NON_IMMUNE_daily_reward": margin,
+        "SLOPE_MARGIN_NON_IMMUNE_per_hour": margin_slope,
+        "HOURS_TO_DEREGISTER_threshold": hours_to_threshold,
+    }
+
+
+# Add trend fields to new rank records in place, continuing each UID's state.
+# The first records of a UID seed its state from its latest stored record, so a
+# UID added to the registry later, or missing from earlier snapshots, continues
+# its stored history; records older than a UID's state (e.g. from a backfill)
+# get no trend fields. Returns the new states, which the caller passes to
+# save_trends once the records are stored: a failed write leaves the state
+# as it was, so the retried snapshot gets its trend fields again.
+def apply_trends(backend, subnet, records):
+    with _lock:
+        unseeded = sorted({record["UID"] for record in records if (subnet, record["UID"]) not in _loaded})
+        if unseeded:
+            since = pd.Timestamp.now(tz="UTC").tz_localize(None) - STATE_LOOKBACK
+            for uid, latest in backend.read_latest(subnet, unseeded, since).items():
+                _states[(subnet, uid)] = latest
+            _loaded.update((subnet, uid) for uid in unseeded)
+        states = {}
+        for record in sorted(records, key=lambda record: record["MAX_timestamp"]):
+            key = (subnet, record["UID"])
+            previous = states.get(key, _states.get(key))
+            if previous is not None and _utc(record["MAX_timestamp"]) <= _utc(previous["MAX_timestamp"]):
+                continue
+            record.update(trend_signals(previous, record))
+            states[key] = dict(record)
+    return states
+
+
+# Continue the trends from states returned by apply_trends, after their records
+# were stored
+def save_trends(states):
+    with _lock:
+        _states.update(states)
+
+
+# Latest record with trend fields of each UID of a subnet held by this process
+def latest(subnet):
+    with _lock:
+        return {uid: record for (state_subnet, uid), record in _states.items() if state_subnet == subnet}
+
+
+def clear():
+    with _lock:
+        _states.clear()
+        _loaded.clear()